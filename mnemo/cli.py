@@ -302,6 +302,34 @@ def code_pattern(
         ))
 
 
+@app.command()
+def backfill_namespace(
+    neo4j_uri: str = typer.Option("bolt://localhost:7687", help="Neo4j URI"),
+    neo4j_user: str = typer.Option("neo4j", help="Neo4j username"),
+    neo4j_password: str = typer.Option("password123", help="Neo4j password"),
+    batch_size: int = typer.Option(10000, help="Nodes updated per transaction")
+):
+    """Set namespace on code graph nodes analyzed by older versions."""
+    
+    try:
+        from mnemo.graph.neo4j_context_extractor import Neo4jContextExtractor
+        
+        extractor = Neo4jContextExtractor(neo4j_uri, neo4j_user, neo4j_password)
+        try:
+            updated = extractor.backfill_namespace(batch_size)
+        finally:
+            extractor.close()
+        
+        console.print(f"✅ Set namespace on {updated} nodes")
+        
+    except Exception as e:
+        console.print(Panel(
+            f"❌ Error backfilling namespace: {str(e)}",
+            title="Error",
+            border_style="red"
+        ))
+
+
 def main():
     """Main entry point."""
     app()
@@ -7,6 +7,8 @@ from typing import Dict, List, Set, Tuple, Optional
 from dataclasses import dataclass
 from py2neo import Graph, Node, Relationship
 
+from mnemo.graph.project_stamp import stamp_project
+
 
 @dataclass
 class FunctionInfo:
@@ -308,6 +310,7 @@ class CallGraphBuilder:
         
         # Store in Neo4j
         self._store_graph(all_functions, all_calls, project_name)
+        stamp_project(self.graph.run, project_name)
         
     def _get_module_name(self, file_path: Path, base_dir: str) -> str:
         """Get module name from file path."""
@@ -353,6 +356,7 @@ class CallGraphBuilder:
                 name=func.name,
                 full_name=func.full_name,
                 module=func.module,
+                namespace=func.module,
                 file_path=func.file_path,
                 line_number=func.line_number,
                 class_name=func.class_name,
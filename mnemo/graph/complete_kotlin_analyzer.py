@@ -8,6 +8,8 @@ import time
 from collections import defaultdict
 import difflib
 
+from mnemo.graph.project_stamp import stamp_project, summarise_package_calls
+
 class CompleteKotlinAnalyzer:
     """
     Complete Kotlin analyzer combining:
@@ -107,6 +109,9 @@ class CompleteKotlinAnalyzer:
             print(f"   ✅ Found {len(results['quality']['similar_functions'])} similar functions")
             print(f"   ✅ Found {len(results['quality']['code_smells'])} code smells")
         
+        run_id = stamp_project(self.graph.run, project_name)
+        summarise_package_calls(self.graph.run, project_name, run_id)
+        
         elapsed = time.time() - start_time
         results['total_time'] = elapsed
         
@@ -342,6 +347,7 @@ class CompleteKotlinAnalyzer:
                 "Function",
                 name=func['name'],
                 package=result['package'],
+                namespace=result['package'],
                 file_path=str(relative_path),
                 language="kotlin",
                 project=project_name
@@ -355,6 +361,7 @@ class CompleteKotlinAnalyzer:
                 "Class",
                 name=class_name,
                 package=result['package'],
+                namespace=result['package'],
                 file_path=str(relative_path),
                 language="kotlin",
                 project=project_name
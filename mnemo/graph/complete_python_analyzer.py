@@ -8,6 +8,8 @@ from typing import Dict, List, Optional, Set, Tuple
 from collections import defaultdict
 from py2neo import Graph, Node, Relationship
 
+from mnemo.graph.project_stamp import stamp_project
+
 
 class CompletePythonAnalyzer:
     """Comprehensive Python project analyzer."""
@@ -88,6 +90,8 @@ class CompletePythonAnalyzer:
             print(f"   ✅ Found {len(results['quality']['code_smells'])} code smells")
             print(f"   ✅ Found {len(results['quality']['type_issues'])} type issues")
         
+        stamp_project(self.graph.run, project_name)
+        
         elapsed = time.time() - start_time
         results['total_time'] = elapsed
         
@@ -293,6 +297,7 @@ class CompletePythonAnalyzer:
                 name=func['name'],
                 full_name=f"{result['module']}.{func['name']}",
                 module=result['module'],
+                namespace=result['module'],
                 file_path=str(relative_path),
                 is_async=func.get('is_async', False),
                 decorators=func['decorators'],
@@ -308,6 +313,7 @@ class CompletePythonAnalyzer:
                 name=cls['name'],
                 full_name=f"{result['module']}.{cls['name']}",
                 module=result['module'],
+                namespace=result['module'],
                 file_path=str(relative_path),
                 bases=cls['bases'],
                 method_count=len(cls['methods']),
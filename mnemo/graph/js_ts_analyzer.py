@@ -8,14 +8,18 @@ from pathlib import Path
 from datetime import datetime
 from py2neo import Graph, Node, Relationship
 
+# Call sites marking a file as talking to an HTTP backend
+HTTP_CALL_MARKERS = ('fetch(', 'axios')
+
 
 class JSTypeScriptAnalyzer:
     """Analyze JavaScript/TypeScript projects and build knowledge graphs."""
     
     def __init__(self, neo4j_uri: str = "bolt://localhost:7687",
                  username: str = "neo4j", 
-                 password: str = "password123"):
-        self.graph = Graph(neo4j_uri, auth=(username, password))
+                 password: str = "password123",
+                 graph: Optional[Graph] = None):
+        self.graph = graph or Graph(neo4j_uri, auth=(username, password))
         
     def analyze_frontend_project(self, project_path: str, project_name: str) -> Dict:
         """Analyze a JavaScript/TypeScript frontend project."""
@@ -54,6 +58,8 @@ class JSTypeScriptAnalyzer:
             'components': components_found,
             'stores': stores_found,
             'routes': routes_found,
+            'js_files': files_analyzed,
+            'vue_components': components_found,
             'duration': duration
         }
         
@@ -149,6 +155,7 @@ class JSTypeScriptAnalyzer:
                 type=file_path.suffix[1:],  # js, ts, jsx, tsx
                 imports_count=len(imports),
                 exports_count=len(exports),
+                has_http_call=any(marker in content for marker in HTTP_CALL_MARKERS),
                 project=project_name
             )
             self.graph.create(file_node)
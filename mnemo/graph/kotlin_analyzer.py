@@ -2,6 +2,7 @@
 
 import os
 import re
+from collections import Counter
 from typing import Dict, List, Set, Tuple, Optional
 from pathlib import Path
 from datetime import datetime
@@ -9,14 +10,19 @@ from py2neo import Graph, Node, Relationship
 
 from mnemo.memory.client import MnemoMemoryClient
 
+# Annotations marking a file as exposing REST endpoints
+REST_MARKERS = ('@RestController', '@GetMapping')
+
 
 class KotlinAnalyzer:
     """Analyze Kotlin projects and build knowledge graphs."""
     
     def __init__(self, neo4j_uri: str = "bolt://localhost:7687",
                  username: str = "neo4j", 
-                 password: str = "password123"):
-        self.graph = Graph(neo4j_uri, auth=(username, password))
+                 password: str = "password123",
+                 graph: Optional[Graph] = None):
+        self.graph = graph or Graph(neo4j_uri, auth=(username, password))
+        self.node_counts = Counter()
         
     def analyze_kotlin_project(self, project_path: str, project_name: str) -> Dict:
         """Analyze a Kotlin project and build knowledge graph."""
@@ -38,6 +44,7 @@ class KotlinAnalyzer:
             analyzed_at=start_time.isoformat()
         )
         self.graph.merge(project_node, "KotlinProject", "name")
+        self.node_counts.clear()
         
         # Analyze different aspects
         files_analyzed = self._analyze_kotlin_files(project_path, project_name)
@@ -52,6 +59,8 @@ class KotlinAnalyzer:
             'modules': modules_found,
             'agents': agents_found,
             'concepts': concepts_extracted,
+            'kotlin_files': self.node_counts['KotlinFile'],
+            'kotlin_classes': self.node_counts['KotlinClass'],
             'duration': duration
         }
         
@@ -102,9 +111,11 @@ class KotlinAnalyzer:
                 package=package_name,
                 project=project_name,
                 classes=len(class_info),
-                functions=len(function_info)
+                functions=len(function_info),
+                is_rest=any(marker in content for marker in REST_MARKERS)
             )
             self.graph.create(file_node)
+            self.node_counts['KotlinFile'] += 1
             
             # Create package node
             package_node = Node(
@@ -129,6 +140,7 @@ class KotlinAnalyzer:
                 )
                 self.graph.create(class_node)
                 self.graph.create(Relationship(class_node, "DEFINED_IN", file_node))
+                self.node_counts['KotlinClass'] += 1
             
             # Create function nodes
             for func in function_info:
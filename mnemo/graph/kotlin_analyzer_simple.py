@@ -7,6 +7,8 @@ from pathlib import Path
 from datetime import datetime
 from py2neo import Graph, Node, Relationship
 
+from mnemo.graph.project_stamp import stamp_project
+
 
 class SimpleKotlinAnalyzer:
     """Simple but working Kotlin analyzer."""
@@ -76,6 +78,7 @@ class SimpleKotlinAnalyzer:
                         full_name=full_name,
                         file_path=str(relative_path),
                         package=package_name,
+                        namespace=package_name,
                         project=project_name,
                         language="kotlin",
                         type="class"
@@ -100,6 +103,7 @@ class SimpleKotlinAnalyzer:
                         full_name=full_name,
                         file_path=str(relative_path),
                         package=package_name,
+                        namespace=package_name,
                         project=project_name,
                         language="kotlin",
                         type="function"
@@ -110,6 +114,8 @@ class SimpleKotlinAnalyzer:
             except Exception as e:
                 print(f"[KOTLIN-SIMPLE] Error processing {kt_file}: {e}")
         
+        stamp_project(self.graph.run, project_name)
+        
         duration = (datetime.now() - start_time).total_seconds()
         stats['duration'] = duration
         
@@ -4,7 +4,7 @@ import os
 from typing import Dict, Optional
 from pathlib import Path
 from datetime import datetime
-from py2neo import Graph, Node, Relationship
+from py2neo import Graph, Node
 
 from mnemo.graph.kotlin_analyzer import KotlinAnalyzer
 from mnemo.graph.js_ts_analyzer import JSTypeScriptAnalyzer
@@ -15,14 +15,41 @@ from mnemo.memory.store import MnemoVectorStore
 class MentatAnalyzer:
     """Analyze the complete Mentat project (frontend + backend)."""
     
+    # (label, property) pairs filtered on by the Mentat queries
+    INDEXED_PROPERTIES = [
+        ("Project", "name"),
+        ("Subproject", "project"),
+        ("KotlinFile", "project"),
+        ("KotlinClass", "project"),
+        ("JSFile", "project"),
+        ("VueComponent", "project"),
+        ("MentatNode", "project"),
+        ("Dependency", "project"),
+        ("Import", "project"),
+    ]
+    _indexes_ready = False
+    
     def __init__(self, neo4j_uri: str = "bolt://localhost:7687",
                  username: str = "neo4j", 
                  password: str = "password123",
                  memory_client: Optional[MnemoMemoryClient] = None):
         self.graph = Graph(neo4j_uri, auth=(username, password))
-        self.kotlin_analyzer = KotlinAnalyzer(neo4j_uri, username, password)
-        self.js_ts_analyzer = JSTypeScriptAnalyzer(neo4j_uri, username, password)
+        self.kotlin_analyzer = KotlinAnalyzer(graph=self.graph)
+        self.js_ts_analyzer = JSTypeScriptAnalyzer(graph=self.graph)
         self.memory_client = memory_client
+        self._ensure_indexes()
+        
+    def _ensure_indexes(self):
+        """Create the indexes used by the Mentat queries, once per process."""
+        if MentatAnalyzer._indexes_ready:
+            return
+            
+        tx = self.graph.begin()
+        for label, prop in self.INDEXED_PROPERTIES:
+            tx.run(f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.{prop})")
+        self.graph.commit(tx)
+        
+        MentatAnalyzer._indexes_ready = True
         
     def analyze_mentat_project(self, project_path: str) -> Dict:
         """Analyze the complete Mentat project."""
@@ -45,52 +72,61 @@ class MentatAnalyzer:
         self.graph.merge(project_node, "Project", "name")
         
         results = {}
+        subprojects = []
+        
+        # Resolve both subproject directories with a single directory scan
+        with os.scandir(project_path) as it:
+            entries = {entry.name: entry for entry in it}
         
         # Analyze frontend
-        frontend_path = project_path / "frontend"
-        if frontend_path.exists():
+        frontend_entry = entries.get("frontend")
+        if frontend_entry and frontend_entry.is_dir():
             print("[MENTAT] Analyzing frontend...")
             frontend_stats = self.js_ts_analyzer.analyze_frontend_project(
-                str(frontend_path), "mentat"
+                frontend_entry.path, "mentat"
             )
             results['frontend'] = frontend_stats
-            
-            # Create frontend subproject node
-            frontend_node = Node(
-                "Subproject",
-                name="mentat-frontend",
-                type="frontend",
-                framework=frontend_stats.get('framework', 'Vue'),
-                project="mentat"
-            )
-            self.graph.create(frontend_node)
-            self.graph.create(Relationship(frontend_node, "PART_OF", project_node))
+            subprojects.append({
+                'name': "mentat-frontend",
+                'props': {
+                    'type': "frontend",
+                    'framework': frontend_stats.get('framework', 'Vue'),
+                    'project': "mentat"
+                }
+            })
         
         # Analyze backend
-        backend_path = project_path / "backend"
-        if backend_path.exists():
+        backend_entry = entries.get("backend")
+        if backend_entry and backend_entry.is_dir():
             print("[MENTAT] Analyzing backend...")
             backend_stats = self.kotlin_analyzer.analyze_kotlin_project(
-                str(backend_path), "mentat"
+                backend_entry.path, "mentat"
             )
             results['backend'] = backend_stats
-            
-            # Create backend subproject node
-            backend_node = Node(
-                "Subproject",
-                name="mentat-backend",
-                type="backend",
-                framework="Spring Boot + Spice",
-                project="mentat"
-            )
-            self.graph.create(backend_node)
-            self.graph.create(Relationship(backend_node, "PART_OF", project_node))
+            subprojects.append({
+                'name': "mentat-backend",
+                'props': {
+                    'type': "backend",
+                    'framework': "Spring Boot + Spice",
+                    'project': "mentat"
+                }
+            })
+        
+        # Create subproject nodes and their PART_OF edges in one statement
+        if subprojects:
+            self.graph.run("""
+                UNWIND $rows AS r
+                MERGE (p:Project {name: 'mentat'})
+                MERGE (s:Subproject {name: r.name})
+                SET s += r.props
+                MERGE (s)-[:PART_OF]->(p)
+            """, rows=subprojects)
         
         # Analyze architecture connections
         self._analyze_architecture_connections()
         
         # Generate insights
-        insights = self._generate_mentat_insights()
+        insights = self._generate_mentat_insights(results)
         results['insights'] = insights
         
         duration = (datetime.now() - start_time).total_seconds()
@@ -105,45 +141,45 @@ class MentatAnalyzer:
         
     def _analyze_architecture_connections(self):
         """Analyze connections between frontend and backend."""
-        # Find API endpoints in backend
-        api_endpoints = self.graph.run("""
-            MATCH (f:KotlinFile {project: 'mentat'})
-            WHERE f.content CONTAINS '@RestController' OR f.content CONTAINS '@GetMapping'
-            RETURN f.name as file, f.path as path
-        """).data()
-        
-        # Find API calls in frontend
-        api_calls = self.graph.run("""
-            MATCH (f:JSFile {project: 'mentat'})
-            WHERE f.content CONTAINS 'fetch(' OR f.content CONTAINS 'axios'
-            RETURN f.name as file, f.path as path
-        """).data()
-        
-        # Create API connection nodes
-        if api_endpoints and api_calls:
-            api_node = Node(
-                "Architecture",
-                type="API_Layer",
-                backend_endpoints=len(api_endpoints),
-                frontend_calls=len(api_calls),
-                project="mentat"
-            )
-            self.graph.create(api_node)
+        # Count backend API endpoints and frontend API calls from the flags
+        # set at ingest, and create the API connection node server-side
+        self.graph.run("""
+            CALL {
+                MATCH (f:KotlinFile {project: $project, is_rest: true})
+                RETURN count(f) as api_endpoints
+            }
+            CALL {
+                MATCH (f:JSFile {project: $project, has_http_call: true})
+                RETURN count(f) as api_calls
+            }
+            WITH api_endpoints, api_calls
+            WHERE api_endpoints > 0 AND api_calls > 0
+            CREATE (:Architecture {
+                type: 'API_Layer',
+                backend_endpoints: api_endpoints,
+                frontend_calls: api_calls,
+                project: $project
+            })
+        """, project="mentat")
             
-    def _generate_mentat_insights(self) -> Dict:
+    def _generate_mentat_insights(self, results: Dict) -> Dict:
         """Generate comprehensive insights about Mentat."""
         insights = {}
         
-        # Overall architecture
-        overall = self.graph.run("""
-            MATCH (n {project: 'mentat'})
-            RETURN 
-                sum(CASE WHEN 'VueComponent' IN labels(n) THEN 1 ELSE 0 END) as vue_components,
-                sum(CASE WHEN 'KotlinClass' IN labels(n) THEN 1 ELSE 0 END) as kotlin_classes,
-                sum(CASE WHEN 'MentatNode' IN labels(n) THEN 1 ELSE 0 END) as mentat_nodes,
-                sum(CASE WHEN 'JSFile' IN labels(n) THEN 1 ELSE 0 END) as js_files,
-                sum(CASE WHEN 'KotlinFile' IN labels(n) THEN 1 ELSE 0 END) as kotlin_files
-        """).data()[0]
+        # Overall architecture. Per-label counts were already collected while
+        # ingesting; a missing subproject simply contributes zero nodes.
+        frontend_stats = results.get('frontend', {})
+        backend_stats = results.get('backend', {})
+        overall = {
+            'vue_components': frontend_stats.get('vue_components', 0),
+            'kotlin_classes': backend_stats.get('kotlin_classes', 0),
+            'mentat_nodes': self.graph.run(
+                "MATCH (m:MentatNode {project: $project}) RETURN count(m)",
+                project="mentat"
+            ).evaluate(),
+            'js_files': frontend_stats.get('js_files', 0),
+            'kotlin_files': backend_stats.get('kotlin_files', 0),
+        }
         
         insights['architecture'] = overall
         
@@ -152,22 +188,22 @@ class MentatAnalyzer:
         insights['frontend'] = frontend_insights
         
         # Mentat-specific nodes
-        mentat_nodes = self.graph.run("""
+        cursor = self.graph.run("""
             MATCH (m:MentatNode {project: 'mentat'})
             RETURN m.type as type, count(m) as count
             ORDER BY count DESC
-        """).data()
+        """)
         
-        insights['node_types'] = mentat_nodes
+        insights['node_types'] = [dict(record) for record in cursor]
         
         # Dependencies analysis
-        key_deps = self.graph.run("""
+        cursor = self.graph.run("""
             MATCH (d:Dependency {project: 'mentat'})
             WHERE d.name IN ['@tiptap/core', 'vue-flow', 'chart.js', 'marked', 'tailwindcss']
             RETURN d.name as dependency, d.version as version
-        """).data()
+        """)
         
-        insights['key_dependencies'] = key_deps
+        insights['key_dependencies'] = [dict(record) for record in cursor]
         
         # Spice integration
         spice_usage = self.graph.run("""
@@ -200,7 +236,7 @@ class MentatAnalyzer:
         # Node types
         node_types = results['insights'].get('node_types', [])
         if node_types:
-            node_summary = ", ".join([f"{n['type']} ({n['count']})" for n in node_types])
+            node_summary = ", ".join(f"{n['type']} ({n['count']})" for n in node_types)
             self.memory_client.remember(
                 key="mentat_node_types",
                 content=f"Mentat implements these node types: {node_summary}. "
@@ -212,7 +248,7 @@ class MentatAnalyzer:
         # Key features
         key_deps = results['insights'].get('key_dependencies', [])
         if key_deps:
-            deps_summary = ", ".join([d['dependency'] for d in key_deps])
+            deps_summary = ", ".join(d['dependency'] for d in key_deps)
             self.memory_client.remember(
                 key="mentat_features",
                 content=f"Mentat uses: {deps_summary}. "
@@ -1,160 +1,404 @@
 """Extract code context from Neo4j for AI assistants."""
 
-from typing import Dict, List, Optional, Union
-from py2neo import Graph
+from collections import OrderedDict
+from functools import wraps
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Union
+from neo4j import AsyncGraphDatabase, GraphDatabase
+from neo4j.exceptions import DriverError, Neo4jError
+import asyncio
+import copy
+import io
 import json
+import re
+import time
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def _escape_lucene(text: str) -> str:
+    """Escape Lucene query syntax so text is matched literally."""
+    return _LUCENE_SPECIAL.sub(r'\\\1', text)
+
+
+def _cached_read(method):
+    """Memoise a read method on (project, arguments, graph version)."""
+    @wraps(method)
+    def wrapper(self, project_name, *args, **kwargs):
+        return self._cached(
+            (method.__name__, project_name, json.dumps([args, kwargs], sort_keys=True, default=str)),
+            project_name,
+            lambda: method(self, project_name, *args, **kwargs)
+        )
+    return wrapper
 
 
 class Neo4jContextExtractor:
     """Extract various code contexts from Neo4j knowledge graph."""
     
+    # (index name, label, properties) backing the extractor's lookups
+    INDEXES = [
+        ("func_proj_name", "Function", ("project", "name")),
+        ("func_proj_package", "Function", ("project", "package")),
+        ("func_proj_namespace", "Function", ("project", "namespace")),
+        ("class_proj_name", "Class", ("project", "name")),
+        ("package_proj_name", "Package", ("project", "name")),
+        ("file_proj_path", "File", ("project", "relative_path")),
+        ("dsl_proj_type", "DSLBlock", ("project", "type")),
+        ("project_name", "Project", ("name",)),
+    ]
+    _indexes_ready = False
+    
+    # Project info and all counts in a single round-trip; each count runs in
+    # its own subquery to avoid a cartesian product
+    OVERVIEW_QUERY = """
+        OPTIONAL MATCH (proj:Project {name: $project})
+        CALL { MATCH (f:Function {project: $project}) RETURN count(f) as functions }
+        CALL { MATCH (c:Class {project: $project}) RETURN count(c) as classes }
+        CALL { MATCH (f:File {project: $project}) RETURN count(f) as files }
+        CALL { MATCH (p:Package {project: $project}) RETURN count(p) as packages }
+        CALL { MATCH (d:DSLBlock {project: $project}) RETURN count(d) as dsl_blocks }
+        RETURN proj, functions, classes, files, packages, dsl_blocks
+    """
+    
+    # Top-level structure
+    TOP_PACKAGES_QUERY = """
+        MATCH (pkg:Package {project: $project})
+        WITH pkg,
+             COUNT { (f:Function {project: $project, package: pkg.name}) } as functions,
+             COUNT { (c:Class {project: $project, package: pkg.name}) } as classes
+        RETURN pkg.name as package, functions, classes
+        ORDER BY functions + classes DESC
+        LIMIT 10
+    """
+    
     def __init__(self, neo4j_uri: str = "bolt://localhost:7687",
                  username: str = "neo4j", 
-                 password: str = "password123"):
-        self.graph = Graph(neo4j_uri, auth=(username, password))
+                 password: str = "password123",
+                 max_connection_pool_size: int = 50,
+                 connection_acquisition_timeout: float = 30,
+                 cache_size: int = 256,
+                 version_ttl: float = 5.0):
+        self._driver_config = {
+            'uri': neo4j_uri,
+            'auth': (username, password),
+            'max_connection_pool_size': max_connection_pool_size,
+            'connection_acquisition_timeout': connection_acquisition_timeout
+        }
+        self.driver = GraphDatabase.driver(**self._driver_config)
+        self.async_driver = None
+        self.cache_size = cache_size
+        self.version_ttl = version_ttl
+        self._cache = OrderedDict()
+        self._versions = {}
+        self._has_apoc = None
+        self._ensure_indexes()
+    
+    def _ensure_indexes(self):
+        """Create the composite indexes used by the read queries, once per process."""
+        if Neo4jContextExtractor._indexes_ready:
+            return
+        
+        def create_indexes(tx):
+            for name, label, props in self.INDEXES:
+                columns = ", ".join(f"n.{prop}" for prop in props)
+                tx.run(f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON ({columns})")
+            tx.run("CREATE FULLTEXT INDEX fn_name IF NOT EXISTS FOR (n:Function|Class) ON EACH [n.name]")
+        
+        with self.driver.session() as session:
+            session.execute_write(create_indexes)
+        
+        Neo4jContextExtractor._indexes_ready = True
+    
+    def backfill_namespace(self, batch_size: int = 10000) -> int:
+        """One-off migration for graphs analyzed before ``namespace`` existed.
+        
+        Those graphs only carry package (Kotlin) or module (Python) on their
+        Function and Class nodes. Commits every ``batch_size`` nodes so large
+        graphs do not build one huge transaction. Returns the nodes updated.
+        """
+        # CALL { ... } IN TRANSACTIONS needs an auto-commit transaction
+        with self.driver.session() as session:
+            summary = session.run("""
+                MATCH (n)
+                WHERE (n:Function OR n:Class) AND n.namespace IS NULL
+                  AND coalesce(n.package, n.module) IS NOT NULL
+                CALL {
+                    WITH n
+                    SET n.namespace = coalesce(n.package, n.module)
+                } IN TRANSACTIONS OF $batch_size ROWS
+            """, batch_size=batch_size).consume()
+        return summary.counters.properties_set
+    
+    def close(self):
+        """Close the driver and release pooled connections."""
+        self.driver.close()
+    
+    async def aclose(self):
+        """Close the async driver, if one was opened."""
+        if self.async_driver is not None:
+            await self.async_driver.close()
+            self.async_driver = None
+    
+    async def _arun(self, query: str, **params) -> List[Dict]:
+        """Async counterpart of _run, on a lazily created async driver."""
+        if self.async_driver is None:
+            # The pool must be at least as wide as the queries gathered at once
+            self.async_driver = AsyncGraphDatabase.driver(**self._driver_config)
+        
+        async def read(tx):
+            result = await tx.run(query, params)
+            return await result.data()
+        
+        async with self.async_driver.session() as session:
+            return await session.execute_read(read)
+    
+    def _run(self, query: str, **params) -> List[Dict]:
+        """Run a read query on a pooled session and return its records."""
+        with self.driver.session() as session:
+            return session.execute_read(lambda tx: tx.run(query, params).data())
+    
+    def _stream(self, query: str, fetch_size: int = 1000, **params) -> Iterator[Dict]:
+        """Yield records one at a time instead of materialising the result."""
+        with self.driver.session(fetch_size=fetch_size) as session:
+            for record in session.run(query, params):
+                yield record.data()
     
+    def clear_cache(self):
+        """Drop all memoised read results."""
+        self._cache.clear()
+        self._versions.clear()
+    
+    def _apoc_available(self) -> bool:
+        """Check once whether the APOC path expander is installed."""
+        if self._has_apoc is None:
+            try:
+                rows = self._run("""
+                    SHOW PROCEDURES YIELD name
+                    WHERE name = 'apoc.path.subgraphAll'
+                    RETURN count(*) as available
+                """)
+            except Neo4jError:
+                # SHOW PROCEDURES needs Neo4j 4.3+ and may be denied to the role
+                self._has_apoc = False
+            except DriverError:
+                # Connection trouble says nothing about APOC; probe again later
+                return False
+            else:
+                self._has_apoc = rows[0]['available'] > 0
+        return self._has_apoc
+    
+    def _graph_version(self, project_name: str) -> Optional[str]:
+        """Cheap probe that changes whenever the project graph is rebuilt.
+        
+        Every analyzer stamps a fresh ``analysis_run`` id on the Project
+        node (see mnemo.graph.project_stamp); ``updated_at`` is honoured for
+        other writers. Returns None when the project has no Project node.
+        Probed at most once every ``version_ttl`` seconds per project.
+        """
+        now = time.monotonic()
+        checked = self._versions.get(project_name)
+        if checked and now - checked[0] < self.version_ttl:
+            return checked[1]
+        
+        rows = self._run("""
+            MATCH (p:Project {name: $project})
+            RETURN elementId(p) + ':' + coalesce(p.analysis_run, '') + ':'
+                   + coalesce(toString(p.updated_at), '') as version
+        """, project=project_name)
+        version = rows[0]['version'] if rows else None
+        self._versions[project_name] = (now, version)
+        return version
+    
+    def _package_summary_current(self, project_name: str) -> bool:
+        """Whether the PKG_CALLS summary was built by the latest analysis run."""
+        rows = self._run("""
+            MATCH (p:Project {name: $project})
+            RETURN p.pkg_calls_version IS NOT NULL
+                   AND p.pkg_calls_version = p.analysis_run as current
+        """, project=project_name)
+        return bool(rows and rows[0]['current'])
+    
+    def _cached(self, key: tuple, project_name: str, compute):
+        """Return a cached result for key, computing it on a miss.
+        
+        Callers get their own copy, so mutating a result never alters the cache.
+        """
+        try:
+            version = self._graph_version(project_name)
+        except (Neo4jError, DriverError):
+            version = None
+        if version is None:
+            # Without a version we cannot tell whether a cached entry is stale
+            return compute()
+        key = key + (version,)
+        
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return copy.deepcopy(self._cache[key])
+        
+        result = compute()
+        if 'error' not in result and 'partial_errors' not in result:
+            self._cache[key] = copy.deepcopy(result)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+    
+    @_cached_read
     def get_project_overview(self, project_name: str) -> Dict:
         """Get high-level overview of a project."""
         try:
-            # Get project info first
-            project = self.graph.nodes.match("Project", name=project_name).first()
-            if not project:
-                return {'error': f'Project {project_name} not found'}
-            
-            # Count each type separately to avoid cartesian product
-            func_count = self.graph.run("""
-                MATCH (f:Function {project: $project})
-                RETURN count(f) as count
-            """, project=project_name).evaluate() or 0
-            
-            class_count = self.graph.run("""
-                MATCH (c:Class {project: $project})
-                RETURN count(c) as count
-            """, project=project_name).evaluate() or 0
-            
-            file_count = self.graph.run("""
-                MATCH (f:File {project: $project})
-                RETURN count(f) as count
-            """, project=project_name).evaluate() or 0
-            
-            pkg_count = self.graph.run("""
-                MATCH (p:Package {project: $project})
-                RETURN count(p) as count
-            """, project=project_name).evaluate() or 0
-            
-            dsl_count = self.graph.run("""
-                MATCH (d:DSLBlock {project: $project})
-                RETURN count(d) as count
-            """, project=project_name).evaluate() or 0
-            
-            stats = {
-                'language': project.get('language'),
-                'path': project.get('absolute_path'),
-                'functions': func_count,
-                'classes': class_count,
-                'files': file_count,
-                'packages': pkg_count,
-                'dsl_blocks': dsl_count
-            }
-            
-            # Top-level structure
-            packages = self.graph.run("""
-                MATCH (pkg:Package {project: $project})
-                OPTIONAL MATCH (f:Function {project: $project, package: pkg.name})
-                OPTIONAL MATCH (c:Class {project: $project, package: pkg.name})
-                RETURN pkg.name as package,
-                       count(DISTINCT f) as functions,
-                       count(DISTINCT c) as classes
-                ORDER BY count(DISTINCT f) + count(DISTINCT c) DESC
-                LIMIT 10
-            """, project=project_name).data()
-            
-            return {
-                'project': project_name,
-                'language': stats['language'],
-                'path': stats['path'],
-                'stats': {
-                    'functions': stats['functions'],
-                    'classes': stats['classes'],
-                    'files': stats['files'],
-                    'packages': stats['packages'],
-                    'dsl_blocks': stats['dsl_blocks']
-                },
-                'top_packages': packages
-            }
-        except Exception as e:
+            overview = self._run(self.OVERVIEW_QUERY, project=project_name)[0]
+        except (Neo4jError, DriverError) as e:
             return {'error': str(e)}
+        if overview['proj'] is None:
+            return {'error': f'Project {project_name} not found'}
+        
+        # The package breakdown is optional; keep the counts if it fails
+        try:
+            packages = self._run(self.TOP_PACKAGES_QUERY, project=project_name)
+            errors = {}
+        except (Neo4jError, DriverError) as e:
+            packages = None
+            errors = {'top_packages': str(e)}
+        
+        return self._build_overview(project_name, overview, packages, errors)
+    
+    async def aget_project_overview(self, project_name: str) -> Dict:
+        """Async overview; the counts and top packages queries run concurrently."""
+        overview_rows, packages = await asyncio.gather(
+            self._arun(self.OVERVIEW_QUERY, project=project_name),
+            self._arun(self.TOP_PACKAGES_QUERY, project=project_name),
+            return_exceptions=True
+        )
+        if isinstance(overview_rows, BaseException):
+            if isinstance(overview_rows, (Neo4jError, DriverError)):
+                return {'error': str(overview_rows)}
+            raise overview_rows
+        overview = overview_rows[0]
+        if overview['proj'] is None:
+            return {'error': f'Project {project_name} not found'}
+        
+        errors = {}
+        if isinstance(packages, BaseException):
+            if not isinstance(packages, (Neo4jError, DriverError)):
+                raise packages
+            errors['top_packages'] = str(packages)
+            packages = None
+        
+        return self._build_overview(project_name, overview, packages, errors)
+    
+    @staticmethod
+    def _build_overview(project_name: str, overview: Dict, packages: Optional[List[Dict]],
+                        errors: Dict[str, str]) -> Dict:
+        """Shape the overview query results, reporting any failed parts."""
+        project = overview['proj']
+        result = {
+            'project': project_name,
+            'language': project.get('language'),
+            'path': project.get('absolute_path'),
+            'stats': {
+                'functions': overview['functions'],
+                'classes': overview['classes'],
+                'files': overview['files'],
+                'packages': overview['packages'],
+                'dsl_blocks': overview['dsl_blocks']
+            },
+            'top_packages': packages
+        }
+        if errors:
+            result['partial_errors'] = errors
+        return result
     
     def get_function_context(self, project_name: str, function_name: str, 
                            include_callers: bool = True,
                            include_callees: bool = True) -> Dict:
         """Get detailed context about a specific function."""
+        # Function lookup, callers and callees come back in one round-trip
+        context = self.get_function_contexts(
+            project_name, [function_name],
+            include_callers=include_callers,
+            include_callees=include_callees
+        )
+        if 'error' in context:
+            return context
+        if not context['functions']:
+            return {'error': f'Function {function_name} not found in {project_name}'}
+        
+        return {'functions': context['functions']}
+    
+    @_cached_read
+    def get_function_contexts(self, project_name: str, function_names: List[str],
+                              include_callers: bool = True,
+                              include_callees: bool = True) -> Dict:
+        """Get context for several functions in a single query."""
         try:
-            # Find the function(s)
-            functions = self.graph.run("""
-                MATCH (f:Function {project: $project, name: $function})
+            rows = self._run("""
+                UNWIND $names as fname
+                MATCH (f:Function {project: $project, name: fname})
                 OPTIONAL MATCH (f)-[:DEFINED_IN]->(file:File)
-                RETURN f, file.relative_path as file_path
-            """, project=project_name, function=function_name).data()
-            
-            if not functions:
-                return {'error': f'Function {function_name} not found in {project_name}'}
+                OPTIONAL MATCH (caller:Function {project: $project})-[:CALLS]->(f)
+                WHERE caller <> f
+                WITH f, file, collect(DISTINCT caller {.name, package: caller.namespace})[..20] as callers
+                OPTIONAL MATCH (f)-[:CALLS]->(callee:Function {project: $project})
+                WHERE callee <> f
+                RETURN f.name as name, f.namespace as package,
+                       coalesce(f.language, 'unknown') as language,
+                       file.relative_path as file_path, callers,
+                       collect(DISTINCT callee {.name, package: callee.namespace})[..20] as callees
+            """, project=project_name, names=list(function_names))
             
             results = []
-            for func_data in functions:
-                func = func_data['f']
+            for row in rows:
                 result = {
-                    'name': func['name'],
-                    'package': func.get('package', func.get('module')),
-                    'file': func_data['file_path'],
-                    'language': func.get('language', 'unknown')
+                    'name': row['name'],
+                    'package': row['package'],
+                    'file': row['file_path'],
+                    'language': row['language']
                 }
-                
-                # Get callers
                 if include_callers:
-                    callers = self.graph.run("""
-                        MATCH (caller:Function {project: $project})-[:CALLS]->(f:Function {project: $project, name: $function})
-                        WHERE caller <> f
-                        RETURN DISTINCT caller.name as name, 
-                               caller.package as package,
-                               caller.module as module
-                        LIMIT 20
-                    """, project=project_name, function=function_name).data()
-                    result['callers'] = callers
-                
-                # Get callees
+                    result['callers'] = row['callers']
                 if include_callees:
-                    callees = self.graph.run("""
-                        MATCH (f:Function {project: $project, name: $function})-[:CALLS]->(callee:Function {project: $project})
-                        WHERE f <> callee
-                        RETURN DISTINCT callee.name as name,
-                               callee.package as package,
-                               callee.module as module
-                        LIMIT 20
-                    """, project=project_name, function=function_name).data()
-                    result['callees'] = callees
-                
+                    result['callees'] = row['callees']
                 results.append(result)
             
-            return {'functions': results}
-        except Exception as e:
+            found = {result['name'] for result in results}
+            return {
+                'functions': results,
+                'not_found': [name for name in function_names if name not in found]
+            }
+        except (Neo4jError, DriverError) as e:
             return {'error': str(e)}
     
+    @_cached_read
     def get_class_hierarchy(self, project_name: str, class_name: Optional[str] = None) -> Dict:
         """Get class hierarchy information."""
         try:
             if class_name:
                 # Specific class
-                classes = self.graph.run("""
+                classes = self._run("""
                     MATCH (c:Class {project: $project, name: $class})
                     OPTIONAL MATCH (c)-[:INHERITS_FROM]->(parent:Class)
                     OPTIONAL MATCH (child:Class)-[:INHERITS_FROM]->(c)
                     OPTIONAL MATCH (c)-[:DEFINED_IN]->(file:File)
-                    RETURN c,
+                    RETURN c, c.namespace as package,
                            collect(DISTINCT parent.name) as parents,
                            collect(DISTINCT child.name) as children,
                            file.relative_path as file_path
-                """, project=project_name, **{"class": class_name}).data()
+                """, project=project_name, **{"class": class_name})
                 
                 if not classes:
                     return {'error': f'Class {class_name} not found'}
@@ -164,7 +408,7 @@ class Neo4jContextExtractor:
                     cls = cls_data['c']
                     result.append({
                         'name': cls['name'],
-                        'package': cls.get('package', cls.get('module')),
+                        'package': cls_data['package'],
                         'file': cls_data['file_path'],
                         'parents': cls_data['parents'],
                         'children': cls_data['children'],
@@ -176,99 +420,179 @@ class Neo4jContextExtractor:
                 return {'classes': result}
             else:
                 # All classes with hierarchy
-                hierarchy = self.graph.run("""
+                hierarchy = self._run("""
                     MATCH (c:Class {project: $project})
-                    OPTIONAL MATCH (c)-[:INHERITS_FROM]->(parent:Class {project: $project})
                     RETURN c.name as class,
-                           c.package as package,
-                           collect(DISTINCT parent.name) as parents
+                           c.namespace as package,
+                           [(c)-[:INHERITS_FROM]->(parent:Class {project: $project}) | parent.name] as parents
                     ORDER BY c.name
-                """, project=project_name).data()
+                """, project=project_name)
                 
                 return {'class_hierarchy': hierarchy}
-        except Exception as e:
+        except (Neo4jError, DriverError) as e:
             return {'error': str(e)}
     
+    @_cached_read
     def get_call_graph(self, project_name: str, function_name: Optional[str] = None,
                       depth: int = 2) -> Dict:
         """Get call graph starting from a function or entire project."""
         try:
             if function_name:
                 # Call graph from specific function
-                query = """
-                    MATCH path = (start:Function {project: $project, name: $function})-[:CALLS*1..%d]->(end:Function {project: $project})
-                    WITH nodes(path) as functions
-                    UNWIND range(0, size(functions)-2) as i
-                    WITH functions[i] as caller, functions[i+1] as callee
-                    RETURN DISTINCT 
-                           caller.name as from,
-                           caller.package as from_package,
-                           callee.name as to,
-                           callee.package as to_package
-                    LIMIT 100
-                """ % depth
+                if self._apoc_available():
+                    # Visit every reachable function once instead of
+                    # enumerating each path up to the requested depth
+                    rows = self._run("""
+                        MATCH (start:Function {project: $project, name: $function})
+                        CALL apoc.path.subgraphAll(start, {
+                            relationshipFilter: 'CALLS>',
+                            labelFilter: '+Function',
+                            maxLevel: $depth
+                        })
+                        YIELD relationships
+                        RETURN [r IN relationships WHERE endNode(r).project = $project | {
+                                   from: startNode(r).name,
+                                   from_package: startNode(r).namespace,
+                                   to: endNode(r).name,
+                                   to_package: endNode(r).namespace
+                               }] as edges
+                    """, project=project_name, function=function_name, depth=depth)
+                    
+                    unique_edges = {}
+                    for row in rows:
+                        for edge in row['edges']:
+                            key = (edge['from'], edge['from_package'], edge['to'], edge['to_package'])
+                            unique_edges.setdefault(key, edge)
+                    edges = list(unique_edges.values())[:100]
+                else:
+                    query = """
+                        MATCH path = (start:Function {project: $project, name: $function})-[:CALLS*1..%d]->(end:Function {project: $project})
+                        WITH nodes(path) as functions
+                        UNWIND range(0, size(functions)-2) as i
+                        WITH functions[i] as caller, functions[i+1] as callee
+                        RETURN DISTINCT 
+                               caller.name as from,
+                               caller.namespace as from_package,
+                               callee.name as to,
+                               callee.namespace as to_package
+                        LIMIT 100
+                    """ % depth
+                    
+                    edges = self._run(query, project=project_name, function=function_name)
                 
-                edges = self.graph.run(query, project=project_name, function=function_name).data()
-                
-                # Also get the starting node
-                nodes = {function_name: {'package': None}}
-                for edge in edges:
-                    nodes[edge['from']] = {'package': edge['from_package']}
-                    nodes[edge['to']] = {'package': edge['to_package']}
+                # Unique node names, starting node first, in first-seen order
+                nodes = list(dict.fromkeys(chain(
+                    (function_name,),
+                    chain.from_iterable((edge['from'], edge['to']) for edge in edges)
+                )))
                 
                 return {
                     'start_function': function_name,
                     'depth': depth,
-                    'nodes': list(nodes.keys()),
+                    'nodes': nodes,
                     'edges': edges
                 }
             else:
-                # Entire project call graph (limited)
-                edges = self.graph.run("""
+                # Entire project call graph (limited). Records are consumed
+                # as they arrive; only the edges returned as context are kept.
+                nodes = set()
+                edges = []
+                edge_count = 0
+                for edge in self._stream("""
                     MATCH (f1:Function {project: $project})-[:CALLS]->(f2:Function {project: $project})
                     WHERE f1 <> f2
                     RETURN f1.name as from,
-                           f1.package as from_package,
+                           f1.namespace as from_package,
                            f2.name as to,
-                           f2.package as to_package
+                           f2.namespace as to_package
                     LIMIT 200
-                """, project=project_name).data()
-                
-                nodes = set()
-                for edge in edges:
+                """, project=project_name):
+                    edge_count += 1
                     nodes.add(edge['from'])
                     nodes.add(edge['to'])
+                    if len(edges) < 50:  # Limit for context
+                        edges.append(edge)
                 
                 return {
                     'project': project_name,
                     'node_count': len(nodes),
-                    'edge_count': len(edges),
-                    'edges': edges[:50]  # Limit for context
+                    'edge_count': edge_count,
+                    'edges': edges
                 }
-        except Exception as e:
+        except (Neo4jError, DriverError) as e:
             return {'error': str(e)}
     
+    def get_call_graph_arrow(self, project_name: str, limit: Optional[int] = None) -> 'pa.Table':
+        """Get the project call graph as an Arrow table of dictionary-encoded edges.
+        
+        The ``from`` and ``to`` columns share one dictionary of unique function
+        names, so each endpoint is stored as an int32 code.
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for get_call_graph_arrow (pip install pyarrow)")
+        
+        query = """
+            MATCH (f1:Function {project: $project})-[:CALLS]->(f2:Function {project: $project})
+            WHERE f1 <> f2
+            RETURN f1.name as from, f2.name as to
+        """
+        if limit is not None:
+            query += " LIMIT %d" % limit
+        
+        codes = {}
+        from_ids = []
+        to_ids = []
+        for edge in self._stream(query, project=project_name):
+            from_ids.append(codes.setdefault(edge['from'], len(codes)))
+            to_ids.append(codes.setdefault(edge['to'], len(codes)))
+        
+        names = pa.array(list(codes), type=pa.string())
+        return pa.table({
+            'from': pa.DictionaryArray.from_arrays(pa.array(from_ids, type=pa.int32()), names),
+            'to': pa.DictionaryArray.from_arrays(pa.array(to_ids, type=pa.int32()), names)
+        })
+    
+    @_cached_read
     def get_package_dependencies(self, project_name: str, package_name: Optional[str] = None) -> Dict:
         """Get package-level dependencies."""
         try:
+            # Read the (:Package)-[:PKG_CALLS]->(:Package) summary the analyzers
+            # build (mnemo.graph.project_stamp); when it is missing or stale,
+            # aggregate the Function CALLS edges directly
+            summarised = self._package_summary_current(project_name)
+            
             if package_name:
                 # Dependencies of specific package
-                deps = self.graph.run("""
-                    MATCH (f1:Function {project: $project, package: $package})-[:CALLS]->(f2:Function {project: $project})
-                    WHERE f1.package <> f2.package
-                    WITH f2.package as dep_package, count(*) as call_count
-                    RETURN dep_package, call_count
-                    ORDER BY call_count DESC
-                """, project=project_name, package=package_name).data()
+                if summarised:
+                    deps = self._run("""
+                        MATCH (:Package {project: $project, name: $package})-[r:PKG_CALLS]->(dep:Package)
+                        RETURN dep.name as dep_package, r.count as call_count
+                        ORDER BY call_count DESC
+                    """, project=project_name, package=package_name)
+                else:
+                    deps = self._run("""
+                        MATCH (f1:Function {project: $project, namespace: $package})-[:CALLS]->(f2:Function {project: $project})
+                        WHERE f1.namespace <> f2.namespace
+                        WITH f2.namespace as dep_package, count(*) as call_count
+                        RETURN dep_package, call_count
+                        ORDER BY call_count DESC
+                    """, project=project_name, package=package_name)
                 
                 # Who depends on this package
-                dependents = self.graph.run("""
-                    MATCH (f1:Function {project: $project})-[:CALLS]->(f2:Function {project: $project, package: $package})
-                    WHERE f1.package <> f2.package
-                    WITH f1.package as dependent_package, count(*) as call_count
-                    RETURN dependent_package, call_count
-                    ORDER BY call_count DESC
-                """, project=project_name, package=package_name).data()
+                if summarised:
+                    dependents = self._run("""
+                        MATCH (src:Package)-[r:PKG_CALLS]->(:Package {project: $project, name: $package})
+                        RETURN src.name as dependent_package, r.count as call_count
+                        ORDER BY call_count DESC
+                    """, project=project_name, package=package_name)
+                else:
+                    dependents = self._run("""
+                        MATCH (f1:Function {project: $project})-[:CALLS]->(f2:Function {project: $project, namespace: $package})
+                        WHERE f1.namespace <> f2.namespace
+                        WITH f1.namespace as dependent_package, count(*) as call_count
+                        RETURN dependent_package, call_count
+                        ORDER BY call_count DESC
+                    """, project=project_name, package=package_name)
                 
                 return {
                     'package': package_name,
@@ -277,152 +601,186 @@ class Neo4jContextExtractor:
                 }
             else:
                 # All package dependencies
-                deps = self.graph.run("""
-                    MATCH (f1:Function {project: $project})-[:CALLS]->(f2:Function {project: $project})
-                    WHERE f1.package <> f2.package
-                    WITH f1.package as from_package, f2.package as to_package, count(*) as calls
-                    RETURN from_package, to_package, calls
-                    ORDER BY calls DESC
-                    LIMIT 50
-                """, project=project_name).data()
+                if summarised:
+                    deps = self._run("""
+                        MATCH (p1:Package {project: $project})-[r:PKG_CALLS]->(p2:Package)
+                        RETURN p1.name as from_package, p2.name as to_package, r.count as calls
+                        ORDER BY calls DESC
+                        LIMIT 50
+                    """, project=project_name)
+                else:
+                    deps = self._run("""
+                        MATCH (f1:Function {project: $project})-[:CALLS]->(f2:Function {project: $project})
+                        WHERE f1.namespace <> f2.namespace
+                        WITH f1.namespace as from_package, f2.namespace as to_package, count(*) as calls
+                        RETURN from_package, to_package, calls
+                        ORDER BY calls DESC
+                        LIMIT 50
+                    """, project=project_name)
                 
                 return {'package_dependencies': deps}
-        except Exception as e:
+        except (Neo4jError, DriverError) as e:
             return {'error': str(e)}
     
+    @_cached_read
     def get_dsl_patterns(self, project_name: str) -> Dict:
         """Get DSL patterns used in the project."""
         try:
-            patterns = self.graph.run("""
+            # Usage counts for every pattern plus up to three example files
+            # for the top 10, in a single round-trip
+            rows = self._run("""
                 MATCH (dsl:DSLBlock {project: $project})
                 WITH dsl.type as pattern, count(*) as usage_count
-                RETURN pattern, usage_count
                 ORDER BY usage_count DESC
-            """, project=project_name).data()
+                WITH collect({pattern: pattern, usage_count: usage_count}) as ranked
+                UNWIND range(0, size(ranked) - 1) as rank
+                WITH ranked[rank].pattern as pattern, ranked[rank].usage_count as usage_count, rank
+                CALL {
+                    WITH pattern, rank
+                    OPTIONAL MATCH (d:DSLBlock {project: $project, type: pattern})-[:DEFINED_IN]->(f:File)
+                    WHERE rank < 10
+                    RETURN collect(DISTINCT f.relative_path)[..3] as files
+                }
+                RETURN pattern, usage_count, rank, files
+                ORDER BY rank
+            """, project=project_name)
             
-            # Get examples for each pattern
-            examples = {}
-            for pattern_data in patterns[:10]:  # Top 10 patterns
-                pattern = pattern_data['pattern']
-                files = self.graph.run("""
-                    MATCH (dsl:DSLBlock {project: $project, type: $pattern})-[:DEFINED_IN]->(f:File)
-                    RETURN DISTINCT f.relative_path as file
-                    LIMIT 3
-                """, project=project_name, pattern=pattern).data()
-                examples[pattern] = [f['file'] for f in files]
+            patterns = [
+                {'pattern': row['pattern'], 'usage_count': row['usage_count']}
+                for row in rows
+            ]
+            examples = {row['pattern']: row['files'] for row in rows if row['rank'] < 10}
             
             return {
                 'dsl_patterns': patterns,
                 'examples': examples
             }
-        except Exception as e:
+        except (Neo4jError, DriverError) as e:
             return {'error': str(e)}
     
+    @_cached_read
     def get_circular_dependencies(self, project_name: str) -> Dict:
         """Find circular dependencies in the project."""
         try:
             # Function-level circular dependencies
-            func_cycles = self.graph.run("""
-                MATCH (f1:Function {project: $project})-[:CALLS]->(f2:Function {project: $project})
-                MATCH (f2)-[:CALLS]->(f1)
-                WHERE id(f1) < id(f2)
-                RETURN f1.name as func1, f2.name as func2,
-                       f1.package as package1, f2.package as package2
+            func_cycles = self._run("""
+                MATCH (f1:Function {project: $project})-[:CALLS]->(f2:Function {project: $project})-[:CALLS]->(f1)
+                WHERE f1.name < f2.name
+                   OR (f1.name = f2.name AND f1.namespace < f2.namespace)
+                RETURN DISTINCT f1.name as func1, f2.name as func2,
+                       f1.namespace as package1, f2.namespace as package2
                 LIMIT 20
-            """, project=project_name).data()
+            """, project=project_name)
             
             # Package-level circular dependencies
-            pkg_cycles = self.graph.run("""
+            pkg_cycles = self._run("""
                 MATCH (pkg1:Package {project: $project})<-[:BELONGS_TO]-(f1:Function)-[:CALLS]->(f2:Function)-[:BELONGS_TO]->(pkg2:Package {project: $project})
-                MATCH (pkg2)<-[:BELONGS_TO]-(f3:Function)-[:CALLS]->(f4:Function)-[:BELONGS_TO]->(pkg1)
                 WHERE pkg1.name < pkg2.name
+                WITH DISTINCT pkg1, pkg2
+                MATCH (pkg2)<-[:BELONGS_TO]-(f3:Function)-[:CALLS]->(f4:Function)-[:BELONGS_TO]->(pkg1)
                 RETURN DISTINCT pkg1.name as package1, pkg2.name as package2
                 LIMIT 10
-            """, project=project_name).data()
+            """, project=project_name)
             
             return {
                 'function_cycles': func_cycles,
                 'package_cycles': pkg_cycles
             }
-        except Exception as e:
+        except (Neo4jError, DriverError) as e:
             return {'error': str(e)}
     
+    @_cached_read
     def search_by_pattern(self, project_name: str, pattern: str, 
                          search_type: str = 'function') -> Dict:
         """Search for functions/classes by name pattern."""
         try:
-            if search_type == 'function':
-                results = self.graph.run("""
-                    MATCH (f:Function {project: $project})
-                    WHERE f.name CONTAINS $pattern
-                    OPTIONAL MATCH (f)-[:DEFINED_IN]->(file:File)
-                    RETURN f.name as name,
-                           f.package as package,
+            labels = {'function': 'Function', 'class': 'Class'}
+            if search_type not in labels:
+                return {'error': 'search_type must be "function" or "class"'}
+            label = labels[search_type]
+            
+            if pattern:
+                # The full-text index narrows candidates to names containing a
+                # token matching *pattern*; CONTAINS keeps the exact,
+                # case-sensitive semantics
+                results = self._run(f"""
+                    CALL db.index.fulltext.queryNodes('fn_name', $query) YIELD node as n
+                    WITH n WHERE n:{label} AND n.project = $project AND n.name CONTAINS $pattern
+                    OPTIONAL MATCH (n)-[:DEFINED_IN]->(file:File)
+                    RETURN n.name as name,
+                           n.namespace as package,
                            file.relative_path as file
-                    ORDER BY f.name
+                    ORDER BY n.name
                     LIMIT 50
-                """, project=project_name, pattern=pattern).data()
-            elif search_type == 'class':
-                results = self.graph.run("""
-                    MATCH (c:Class {project: $project})
-                    WHERE c.name CONTAINS $pattern
-                    OPTIONAL MATCH (c)-[:DEFINED_IN]->(file:File)
-                    RETURN c.name as name,
-                           c.package as package,
+                """, project=project_name, pattern=pattern,
+                    query=f"*{_escape_lucene(pattern.lower())}*")
+            else:
+                results = self._run(f"""
+                    MATCH (n:{label} {{project: $project}})
+                    OPTIONAL MATCH (n)-[:DEFINED_IN]->(file:File)
+                    RETURN n.name as name,
+                           n.namespace as package,
                            file.relative_path as file
-                    ORDER BY c.name
+                    ORDER BY n.name
                     LIMIT 50
-                """, project=project_name, pattern=pattern).data()
-            else:
-                return {'error': 'search_type must be "function" or "class"'}
+                """, project=project_name)
             
             return {
                 'search_type': search_type,
                 'pattern': pattern,
                 'results': results
             }
-        except Exception as e:
+        except (Neo4jError, DriverError) as e:
             return {'error': str(e)}
     
+    @_cached_read
     def get_complexity_hotspots(self, project_name: str, limit: int = 10) -> Dict:
         """Get most complex files and functions."""
         try:
             # Complex files
-            files = self.graph.run("""
+            files = self._run("""
                 MATCH (f:File {project: $project})
                 WHERE f.complexity > 100
                 RETURN f.relative_path as file,
                        f.complexity as complexity
                 ORDER BY f.complexity DESC
                 LIMIT $limit
-            """, project=project_name, limit=limit).data()
+            """, project=project_name, limit=limit)
             
             # Functions with many calls
-            busy_functions = self.graph.run("""
+            busy_functions = self._run("""
                 MATCH (f:Function {project: $project})
-                OPTIONAL MATCH (f)-[:CALLS]->(callee:Function)
-                OPTIONAL MATCH (caller:Function)-[:CALLS]->(f)
-                WITH f, count(DISTINCT callee) as calls_out, count(DISTINCT caller) as calls_in
+                WITH f,
+                     COUNT { MATCH (f)-[:CALLS]->(callee:Function) RETURN DISTINCT callee } as calls_out,
+                     COUNT { MATCH (caller:Function)-[:CALLS]->(f) RETURN DISTINCT caller } as calls_in
                 WHERE calls_out + calls_in > 10
                 RETURN f.name as function,
-                       f.package as package,
+                       f.namespace as package,
                        calls_out,
                        calls_in,
                        calls_out + calls_in as total_connections
                 ORDER BY total_connections DESC
                 LIMIT $limit
-            """, project=project_name, limit=limit).data()
+            """, project=project_name, limit=limit)
             
             return {
                 'complex_files': files,
                 'busy_functions': busy_functions
             }
-        except Exception as e:
+        except (Neo4jError, DriverError) as e:
             return {'error': str(e)}
     
+    def export_context_bytes(self, data: Dict) -> bytes:
+        """Export context data as UTF-8 encoded JSON, ready to write to a socket."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        return json.dumps(data, indent=2).encode('utf-8')
+    
     def export_context(self, data: Dict, format: str = 'json') -> str:
         """Export context data in various formats."""
         if format == 'json':
+            if ORJSON_AVAILABLE:
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
             return json.dumps(data, indent=2)
         elif format == 'markdown':
             return self._to_markdown(data)
@@ -433,56 +791,72 @@ class Neo4jContextExtractor:
     
     def _to_markdown(self, data: Dict) -> str:
         """Convert context data to markdown format."""
-        md = []
+        buf = io.StringIO()
+        write = buf.write
+        
+        def line(text: str):
+            # Lines are newline-separated, with no trailing newline
+            if buf.tell():
+                write('\n')
+            write(text)
         
         if 'project' in data and 'stats' in data:
-            md.append(f"# Project: {data['project']}")
-            md.append(f"\n**Language**: {data.get('language', 'unknown')}")
-            md.append(f"**Path**: `{data.get('path', 'N/A')}`")
-            md.append("\n## Statistics")
+            line(f"# Project: {data['project']}")
+            line(f"\n**Language**: {data.get('language', 'unknown')}")
+            line(f"**Path**: `{data.get('path', 'N/A')}`")
+            line("\n## Statistics")
             for key, value in data['stats'].items():
-                md.append(f"- **{key.replace('_', ' ').title()}**: {value}")
+                line(f"- **{key.replace('_', ' ').title()}**: {value}")
         
         if 'functions' in data:
-            md.append("\n## Functions")
+            line("\n## Functions")
             for func in data['functions']:
-                md.append(f"\n### {func['name']}")
-                md.append(f"- **Package**: {func.get('package', 'N/A')}")
-                md.append(f"- **File**: `{func.get('file', 'N/A')}`")
+                func_get = func.get
+                line(f"\n### {func['name']}")
+                line(f"- **Package**: {func['package'] or 'N/A'}")
+                line(f"- **File**: `{func_get('file', 'N/A')}`")
                 
-                if 'callers' in func and func['callers']:
-                    md.append("\n**Called by**:")
-                    for caller in func['callers'][:5]:
-                        md.append(f"- {caller['name']} ({caller.get('package', caller.get('module', 'N/A'))})")
+                callers = func_get('callers')
+                if callers:
+                    line("\n**Called by**:")
+                    for caller in callers[:5]:
+                        line(f"- {caller['name']} ({caller['package'] or 'N/A'})")
                 
-                if 'callees' in func and func['callees']:
-                    md.append("\n**Calls**:")
-                    for callee in func['callees'][:5]:
-                        md.append(f"- {callee['name']} ({callee.get('package', callee.get('module', 'N/A'))})")
+                callees = func_get('callees')
+                if callees:
+                    line("\n**Calls**:")
+                    for callee in callees[:5]:
+                        line(f"- {callee['name']} ({callee['package'] or 'N/A'})")
         
-        return '\n'.join(md)
+        return buf.getvalue()
     
     def _to_summary(self, data: Dict) -> str:
         """Convert context data to a brief summary."""
-        lines = []
-        
         if 'error' in data:
             return f"Error: {data['error']}"
         
+        buf = io.StringIO()
+        write = buf.write
+        
+        def line(text: str):
+            if buf.tell():
+                write('\n')
+            write(text)
+        
         if 'project' in data and 'stats' in data:
             stats = data['stats']
-            lines.append(f"Project {data['project']} ({data.get('language', 'unknown')}): "
-                        f"{stats['functions']} functions, {stats['classes']} classes, "
-                        f"{stats['files']} files")
+            line(f"Project {data['project']} ({data.get('language', 'unknown')}): "
+                 f"{stats['functions']} functions, {stats['classes']} classes, "
+                 f"{stats['files']} files")
         
         if 'functions' in data:
-            lines.append(f"Found {len(data['functions'])} function(s) matching query")
+            line(f"Found {len(data['functions'])} function(s) matching query")
         
         if 'class_hierarchy' in data:
-            lines.append(f"Found {len(data['class_hierarchy'])} classes with hierarchy information")
+            line(f"Found {len(data['class_hierarchy'])} classes with hierarchy information")
         
         if 'edges' in data:
-            lines.append(f"Call graph with {data.get('node_count', len(data.get('nodes', [])))} nodes "
-                        f"and {data.get('edge_count', len(data['edges']))} edges")
+            line(f"Call graph with {data.get('node_count', len(data.get('nodes', [])))} nodes "
+                 f"and {data.get('edge_count', len(data['edges']))} edges")
         
-        return '\n'.join(lines)
\ No newline at end of file
+        return buf.getvalue()
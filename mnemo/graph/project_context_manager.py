@@ -1,10 +1,14 @@
 """Project context manager for cross-project knowledge transfer."""
 
+import copy
+import heapq
 import os
-from typing import Dict, List, Optional, Set
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
-from py2neo import Graph, Node, Relationship
+from neo4j import GraphDatabase
 
 from mnemo.graph.call_graph_builder import CallGraphBuilder
 from mnemo.graph.enhanced_analyzer import EnhancedCodeAnalyzer
@@ -12,17 +16,71 @@ from mnemo.graph.kotlin_analyzer_simple import SimpleKotlinAnalyzer
 from mnemo.memory.client import MnemoMemoryClient
 
 
+# Words too common to be worth a lookup when suggesting implementations
+_STOP = frozenset({"a", "an", "the", "for", "to", "of", "and", "or", "in", "on", "with"})
+
+
 class ProjectContextManager:
     """Manage multiple project contexts in Neo4j."""
     
+    # Seconds a project's stats or pattern lookups are served from memory
+    CACHE_TTL = 60.0
+    
+    # (index name, label, properties) backing the lookups below; names match
+    # the other analyzers so each index is only created once
+    INDEXES = [
+        ("func_project", "Function", ("project",)),
+        ("func_name", "Function", ("name",)),
+        ("func_proj_name", "Function", ("project", "name")),
+        ("project_name", "Project", ("name",)),
+        ("kotlin_file_path", "KotlinFile", ("path",)),
+    ]
+    _indexes_ready = False
+    
     def __init__(self, neo4j_uri: str = "bolt://localhost:7687",
                  username: str = "neo4j", 
                  password: str = "password123",
-                 memory_client: Optional[MnemoMemoryClient] = None):
-        self.graph = Graph(neo4j_uri, auth=(username, password))
+                 memory_client: Optional[MnemoMemoryClient] = None,
+                 cache_size: int = 256):
+        self.driver = GraphDatabase.driver(neo4j_uri, auth=(username, password),
+                                           max_connection_pool_size=50)
         self.memory_client = memory_client
         self.builder = CallGraphBuilder(neo4j_uri, username, password)
         self.analyzer = EnhancedCodeAnalyzer(self.builder)
+        self._stats_cache: Dict[str, Tuple[float, Dict]] = {}
+        # Pattern queries are free text, so keep only the most recently used
+        self.cache_size = cache_size
+        self._pattern_cache: "OrderedDict[Tuple[str, str], Tuple[float, List[Dict]]]" = OrderedDict()
+        self._ensure_indexes()
+    
+    def _ensure_indexes(self):
+        """Create the indexes used by the project queries, once per process."""
+        if ProjectContextManager._indexes_ready:
+            return
+        
+        def create_indexes(tx):
+            for name, label, props in self.INDEXES:
+                columns = ", ".join(f"n.{prop}" for prop in props)
+                tx.run(f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON ({columns})")
+        
+        with self.driver.session() as session:
+            session.execute_write(create_indexes)
+        
+        ProjectContextManager._indexes_ready = True
+    
+    def close(self):
+        """Close the driver and release pooled connections."""
+        self.driver.close()
+    
+    def _run(self, query: str, **params) -> List[Dict]:
+        """Run a read query on a pooled session and return its records."""
+        with self.driver.session() as session:
+            return session.execute_read(lambda tx: tx.run(query, params).data())
+    
+    def _write(self, query: str, **params):
+        """Run a write query in its own transaction."""
+        with self.driver.session() as session:
+            session.execute_write(lambda tx: tx.run(query, params).consume())
         
     def analyze_project(self, project_path: str, project_name: str, 
                        project_type: str = "python",
@@ -33,15 +91,14 @@ class ProjectContextManager:
         analysis_start = datetime.now()
         
         # Create project node
-        project_node = Node(
-            "Project",
-            name=project_name,
-            path=project_path,
-            type=project_type,
-            analyzed_at=analysis_start.isoformat(),
-            tags=list(tags) if tags else []
-        )
-        self.graph.merge(project_node, "Project", "name")
+        self._write("""
+            MERGE (p:Project {name: $name})
+            SET p.path = $path,
+                p.type = $type,
+                p.analyzed_at = $analyzed_at,
+                p.tags = $tags
+        """, name=project_name, path=project_path, type=project_type,
+            analyzed_at=analysis_start.isoformat(), tags=list(tags) if tags else [])
         
         # Build call graph based on project type
         if project_type == "python":
@@ -57,6 +114,8 @@ class ProjectContextManager:
         analysis_end = datetime.now()
         duration = (analysis_end - analysis_start).total_seconds()
         
+        # The graph just changed; drop anything cached for this project
+        self._invalidate_cache(project_name)
         stats = self._get_project_stats(project_name)
         stats['duration'] = duration
         
@@ -101,87 +160,195 @@ class ProjectContextManager:
         except Exception as e:
             print(f"[CONTEXT] Error analyzing Kotlin project: {e}")
         
+    def _invalidate_cache(self, project_name: str):
+        """Forget cached stats and patterns for a project."""
+        self._stats_cache.pop(project_name, None)
+        for key in [key for key in self._pattern_cache if key[0] == project_name]:
+            del self._pattern_cache[key]
+        
     def _get_project_stats(self, project_name: str) -> Dict:
         """Get statistics for a project."""
-        result = self.graph.run("""
+        cached = self._stats_cache.get(project_name)
+        if cached and time.monotonic() - cached[0] < self.CACHE_TTL:
+            return dict(cached[1])
+        
+        result = self._run("""
             MATCH (f:Function {project: $project})
             OPTIONAL MATCH (f)-[c:CALLS]->()
             RETURN 
                 count(DISTINCT f) as functions,
                 count(c) as calls,
                 count(DISTINCT f.file_path) as files
-        """, project=project_name).data()[0]
+        """, project=project_name)[0]
         
-        return result
+        self._stats_cache[project_name] = (time.monotonic(), result)
+        return dict(result)
         
     def find_similar_patterns(self, source_project: str, target_project: str,
                             pattern_type: str = "function") -> List[Dict]:
-        """Find similar patterns between projects."""
+        """Find similar patterns between projects.
+        
+        ``pattern_type`` is "function" (same name), "structure" (same name
+        and a common callee) or "similarity" (Jaccard similarity of the
+        names each function calls).
+        """
         if pattern_type == "function":
-            # Find functions with similar names
-            result = self.graph.run("""
+            # Find functions with similar names; binding the name in the
+            # pattern turns the join into a (project, name) index seek
+            result = self._run("""
                 MATCH (f1:Function {project: $source})
-                MATCH (f2:Function {project: $target})
-                WHERE f1.name = f2.name
+                MATCH (f2:Function {project: $target, name: f1.name})
                 RETURN f1.full_name as source_func, 
                        f2.full_name as target_func,
                        f1.name as name
                 LIMIT 20
             """, source=source_project, target=target_project)
             
+        elif pattern_type == "similarity":
+            # CALLS edges never cross projects, so functions are compared on
+            # the names of their callees rather than the callee nodes
+            rows = self._run("""
+                MATCH (f:Function)-[:CALLS]->(c)
+                WHERE f.project IN [$source, $target] AND c.name IS NOT NULL
+                WITH f, collect(DISTINCT c.name) as calls
+                RETURN f.project as project, f.full_name as function, calls
+            """, source=source_project, target=target_project)
+            result = self._similar_by_callees(rows, source_project, target_project)
+            
         elif pattern_type == "structure":
-            # Find similar call patterns
-            result = self.graph.run("""
-                MATCH (f1:Function {project: $source})-[:CALLS]->(c1)
-                MATCH (f2:Function {project: $target})-[:CALLS]->(c2)
-                WHERE f1.name = f2.name AND c1.name = c2.name
-                RETURN f1.full_name as source_func,
-                       f2.full_name as target_func,
-                       c1.name as common_call
+            # Find similar call patterns: group both projects' calls by
+            # (caller name, callee name) in one scan, then pair the callers
+            # within each group instead of expanding both sides separately
+            result = self._run("""
+                MATCH (f:Function)-[:CALLS]->(c)
+                WHERE f.project IN [$source, $target]
+                WITH f.name as fname, c.name as cname,
+                     collect({project: f.project, full_name: f.full_name}) as rows
+                WITH fname, cname,
+                     [r IN rows WHERE r.project = $source | r.full_name] as src,
+                     [r IN rows WHERE r.project = $target | r.full_name] as tgt
+                WHERE size(src) > 0 AND size(tgt) > 0
+                UNWIND src as source_func
+                UNWIND tgt as target_func
+                RETURN source_func, target_func, cname as common_call
                 LIMIT 20
             """, source=source_project, target=target_project)
             
-        return list(result)
+        return result
+        
+    @staticmethod
+    def _similar_by_callees(rows: List[Dict], source_project: str, target_project: str,
+                            limit: int = 20) -> List[Dict]:
+        """Top function pairs by Jaccard similarity of their callee names."""
+        sources = {}
+        targets = {}
+        for row in rows:
+            calls = frozenset(row['calls'])
+            if row['project'] == source_project:
+                sources[row['function']] = calls
+            if row['project'] == target_project:
+                targets[row['function']] = calls
+        
+        # Only pairs sharing a callee name score above zero, so candidates
+        # come from an index of target functions by the names they call
+        callers = defaultdict(list)
+        for function, calls in targets.items():
+            for name in calls:
+                callers[name].append(function)
+        
+        def scored():
+            for function, calls in sources.items():
+                for candidate in {c for name in calls for c in callers[name]}:
+                    if candidate == function and source_project == target_project:
+                        continue
+                    other = targets[candidate]
+                    yield {
+                        'source_func': function,
+                        'target_func': candidate,
+                        'similarity': len(calls & other) / len(calls | other)
+                    }
+        
+        return heapq.nlargest(limit, scored(), key=lambda x: x['similarity'])
+        
+    def _cached_patterns(self, key: Tuple[str, str]) -> Optional[List[Dict]]:
+        """Return a copy of a fresh cached pattern lookup, or None."""
+        cached = self._pattern_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.CACHE_TTL:
+            self._pattern_cache.move_to_end(key)
+            return copy.deepcopy(cached[1])
+        return None
+        
+    def _cache_patterns(self, key: Tuple[str, str], patterns: List[Dict]):
+        """Store a copy of a pattern lookup, evicting the least recently used."""
+        self._pattern_cache[key] = (time.monotonic(), copy.deepcopy(patterns))
+        self._pattern_cache.move_to_end(key)
+        if len(self._pattern_cache) > self.cache_size:
+            self._pattern_cache.popitem(last=False)
         
     def get_pattern_from_project(self, project_name: str, pattern_query: str) -> Dict:
         """Get specific pattern from a project."""
         # This would use semantic search to find patterns
         # For now, simple name matching
+        key = (project_name, pattern_query)
+        cached = self._cached_patterns(key)
+        if cached is not None:
+            return cached
         
-        result = self.graph.run("""
+        result = self._run("""
             MATCH (f {project: $project})
             WHERE (f:Function OR f:KotlinFunction OR f:KotlinClass)
               AND (toLower(f.name) CONTAINS toLower($query)
                OR toLower(f.class_name) CONTAINS toLower($query))
             OPTIONAL MATCH (f)-[:CALLS]->(callee)
-            RETURN f, collect(callee) as calls
+            WITH f, collect(callee.full_name) as calls
+            RETURN f.full_name as function, f.file_path as file,
+                   f.line_number as line, calls
             LIMIT 5
         """, project=project_name, query=pattern_query)
         
-        patterns = []
-        for record in result:
-            func = record['f']
-            patterns.append({
-                'function': func['full_name'],
-                'file': func['file_path'],
-                'line': func['line_number'],
-                'calls': [c['full_name'] for c in record['calls']]
-            })
-            
+        patterns = [
+            {
+                'function': record['function'],
+                'file': record['file'],
+                'line': record['line'],
+                'calls': record['calls']
+            }
+            for record in result
+        ]
+        
+        self._cache_patterns(key, patterns)
         return patterns
         
     def compare_projects(self, project1: str, project2: str) -> Dict:
         """Compare two projects."""
-        stats1 = self._get_project_stats(project1)
-        stats2 = self._get_project_stats(project2)
+        # Stats for both projects and their common function names in one
+        # round trip; the names of project1 are looked up in project2
+        # instead of joining the two function sets
+        result = self._run("""
+            CALL {
+                UNWIND [$p1, $p2] AS project
+                CALL {
+                    WITH project
+                    MATCH (f:Function {project: project})
+                    OPTIONAL MATCH (f)-[c:CALLS]->()
+                    RETURN count(DISTINCT f) as functions,
+                           count(c) as calls,
+                           count(DISTINCT f.file_path) as files
+                }
+                RETURN collect({functions: functions, calls: calls, files: files}) as stats
+            }
+            CALL {
+                MATCH (f1:Function {project: $p1})
+                WITH DISTINCT f1.name as name
+                MATCH (:Function {project: $p2, name: name})
+                RETURN count(DISTINCT name) as common_count
+            }
+            RETURN stats[0] as stats1, stats[1] as stats2, common_count
+        """, p1=project1, p2=project2)[0]
         
-        # Find common patterns
-        common_functions = self.graph.run("""
-            MATCH (f1:Function {project: $p1})
-            MATCH (f2:Function {project: $p2})
-            WHERE f1.name = f2.name
-            RETURN count(DISTINCT f1.name) as common_count
-        """, p1=project1, p2=project2).data()[0]['common_count']
+        stats1 = result['stats1']
+        stats2 = result['stats2']
+        common_functions = result['common_count']
         
         return {
             'project1': {'name': project1, **stats1},
@@ -195,33 +362,72 @@ class ProjectContextManager:
         """Suggest implementation based on patterns from other projects."""
         suggestions = []
         
-        # Extract keywords from description
-        keywords = description.lower().split()
-        
-        for project in reference_projects:
-            for keyword in keywords:
-                patterns = self.get_pattern_from_project(project, keyword)
-                for pattern in patterns:
-                    suggestions.append({
-                        'from_project': project,
-                        'pattern': pattern,
-                        'relevance': self._calculate_relevance(description, pattern)
-                    })
+        # Extract keywords from description: deduplicated, in order, without
+        # stopwords or very short words. The set is shared by every
+        # relevance score below
+        keywords = list(dict.fromkeys(
+            word for word in description.lower().split()
+            if word not in _STOP and len(word) > 2
+        ))
+        keyword_set = set(keywords)
+        
+        # Same lookup as get_pattern_from_project (up to 5 matches per
+        # project and keyword) and sharing its cache; the pairs it misses
+        # are fetched in one round trip
+        pairs = [(project, keyword) for project in reference_projects for keyword in keywords]
+        found = {pair: self._cached_patterns(pair) for pair in pairs}
+        misses = [pair for pair, patterns in found.items() if patterns is None]
+        
+        if misses:
+            for pair in misses:
+                found[pair] = []
+            result = self._run("""
+                UNWIND $pairs AS pair
+                WITH pair[0] AS project, pair[1] AS keyword
+                CALL {
+                    WITH project, keyword
+                    MATCH (f {project: project})
+                    WHERE (f:Function OR f:KotlinFunction OR f:KotlinClass)
+                      AND (toLower(f.name) CONTAINS keyword
+                       OR toLower(f.class_name) CONTAINS keyword)
+                    RETURN f
+                    LIMIT 5
+                }
+                OPTIONAL MATCH (f)-[:CALLS]->(callee)
+                WITH project, keyword, f, collect(callee.full_name) as calls
+                RETURN project, keyword, f.full_name as function, f.file_path as file,
+                       f.line_number as line, calls
+            """, pairs=[list(pair) for pair in misses])
+            
+            for record in result:
+                found[(record['project'], record['keyword'])].append({
+                    'function': record['function'],
+                    'file': record['file'],
+                    'line': record['line'],
+                    'calls': record['calls']
+                })
+            for pair in misses:
+                self._cache_patterns(pair, found[pair])
+        
+        for (project, _), patterns in found.items():
+            for pattern in patterns:
+                suggestions.append({
+                    'from_project': project,
+                    'pattern': pattern,
+                    'relevance': self._calculate_relevance(keyword_set, pattern)
+                })
                     
-        # Sort by relevance
-        suggestions.sort(key=lambda x: x['relevance'], reverse=True)
-        return suggestions[:10]
+        # Top 10 by relevance, ties kept in query order
+        return heapq.nlargest(10, suggestions, key=lambda x: x['relevance'])
         
-    def _calculate_relevance(self, description: str, pattern: Dict) -> float:
+    @staticmethod
+    def _calculate_relevance(keywords: Set[str], pattern: Dict) -> float:
         """Calculate relevance score."""
         # Simple keyword matching for now
-        keywords = set(description.lower().split())
-        pattern_words = set(pattern['function'].lower().split('.'))
-        
-        if not pattern_words:
+        if not keywords:
             return 0.0
-            
-        return len(keywords & pattern_words) / len(keywords)
+        pattern_words = (pattern['function'] or '').lower().split('.')
+        return len(keywords.intersection(pattern_words)) / len(keywords)
 
 
 def demonstrate_cross_project_context():
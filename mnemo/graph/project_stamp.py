@@ -0,0 +1,52 @@
+"""Analysis run stamps that let cached graph reads detect re-analysis."""
+
+import uuid
+from typing import Any, Callable
+
+# Every analysis run writes a fresh id; Neo4jContextExtractor keys its cached
+# reads on it, so element ids reused after DETACH DELETE cannot serve stale data
+STAMP_PROJECT_QUERY = """
+    MERGE (p:Project {name: $project})
+    SET p.analysis_run = $run_id
+"""
+
+
+def stamp_project(run: Callable[..., Any], project_name: str) -> str:
+    """Record a new analysis run on the project's Project node.
+
+    ``run`` executes a write query with keyword parameters, e.g. py2neo's
+    ``Graph.run`` or an analyzer's ``_write``. Returns the run id.
+    """
+    run_id = uuid.uuid4().hex
+    run(STAMP_PROJECT_QUERY, project=project_name, run_id=run_id)
+    return run_id
+
+# Package-level call counts, rebuilt at the end of every analysis that writes
+# Package nodes so dependency lookups read a handful of PKG_CALLS edges instead
+# of aggregating every CALLS edge
+PACKAGE_SUMMARY_QUERY = """
+    MATCH (proj:Project {name: $project})
+    CALL {
+        MATCH (:Package {project: $project})-[old:PKG_CALLS]->()
+        DELETE old
+    }
+    CALL {
+        MATCH (f1:Function {project: $project})-[:CALLS]->(f2:Function {project: $project})
+        WHERE f1.namespace <> f2.namespace
+        WITH f1.namespace as from_package, f2.namespace as to_package, count(*) as calls
+        MATCH (p1:Package {project: $project, name: from_package})
+        MATCH (p2:Package {project: $project, name: to_package})
+        MERGE (p1)-[r:PKG_CALLS]->(p2)
+        SET r.count = calls
+    }
+    SET proj.pkg_calls_version = $run_id
+"""
+
+
+def summarise_package_calls(run: Callable[..., Any], project_name: str, run_id: str) -> None:
+    """Rebuild the PKG_CALLS summary for the analysis run ``run_id``.
+
+    Neo4jContextExtractor only reads the summary while ``pkg_calls_version``
+    matches the Project node's ``analysis_run``.
+    """
+    run(PACKAGE_SUMMARY_QUERY, project=project_name, run_id=run_id)
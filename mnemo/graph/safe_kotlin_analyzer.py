@@ -1,41 +1,68 @@
 """Safe Kotlin analyzer using compiled JAR - no regex catastrophic backtracking!"""
 
 import subprocess
+import hashlib
 import json
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
-from py2neo import Graph, Node, Relationship
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from neo4j import GraphDatabase
 import time
 import shutil
 
+from mnemo.graph.project_stamp import stamp_project
 
-class SafeKotlinAnalyzer:
-    """
-    Safe Kotlin analyzer that won't hang on comment-heavy files.
-    Uses a pre-compiled Kotlin analyzer JAR instead of regex.
-    """
-    
-    def __init__(self, neo4j_uri: str = "bolt://localhost:7687",
-                 username: str = "neo4j", 
-                 password: str = "password123"):
-        self.graph = Graph(neo4j_uri, auth=(username, password))
-        self.analyzer_jar = self._setup_analyzer()
-        
-    def _setup_analyzer(self) -> Path:
-        """Setup the safe analyzer JAR."""
-        # Check if JAR exists in current directory
-        local_jar = Path("simple_analyzer.jar")
-        if local_jar.exists():
-            return local_jar
-            
-        # Otherwise, create and compile it
-        analyzer_code = '''// Safe Kotlin analyzer
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Build and tooling directories never worth descending into
+SKIP_DIRS = frozenset({'.gradle', 'build', 'out', '.git', 'node_modules'})
+
+# Files larger than this are not worth sending to the analyzer
+MAX_FILE_SIZE = 1000 * 1024  # 1MB limit
+
+# Compiled JARs live here, named after a digest of ANALYZER_SOURCE
+JAR_CACHE_DIR = Path.home() / ".mnemo" / "safe_analyzer"
+
+# Prebuilt fallback used when kotlinc is unavailable; prints a text report
+# for one file per invocation rather than speaking the JSON line protocol
+BUNDLED_JAR_NAME = "simple_analyzer.jar"
+
+ANALYZER_SOURCE = '''// Safe Kotlin analyzer
 import java.io.File
 
+// Built once per JVM rather than once per matching line
+private val FUN_RE = Regex("fun\\\\s+(\\\\w+)")
+private val CLASS_KW = listOf("class ", "interface ", "object ", "data class ")
+
+fun jsonString(value: String): String {
+    val sb = StringBuilder(value.length + 2).append('"')
+    for (c in value) {
+        when {
+            c == '"' -> sb.append("\\\\\\"")
+            c == '\\\\' -> sb.append("\\\\\\\\")
+            c == '\\n' -> sb.append("\\\\n")
+            c == '\\r' -> sb.append("\\\\r")
+            c == '\\t' -> sb.append("\\\\t")
+            c < ' ' -> sb.append(String.format("\\\\u%04x", c.code))
+            else -> sb.append(c)
+        }
+    }
+    return sb.append('"').toString()
+}
+
+fun jsonArray(values: List<String>): String = values.joinToString(",", "[", "]") { jsonString(it) }
+
 fun analyzeFile(path: String): String {
     val file = File(path)
-    val lines = file.readLines()
     
     var packageName = ""
     var imports = 0
@@ -43,8 +70,11 @@ fun analyzeFile(path: String): String {
     val classes = mutableListOf<String>()
     var comments = 0
     var inBlock = false
+    var lineCount = 0
     
-    for (line in lines) {
+    // Stream lines instead of materialising the whole file as a list
+    file.useLines { seq -> seq.forEach { line ->
+        lineCount++
         val trim = line.trim()
         
         // Comment counting (safe!)
@@ -65,96 +95,275 @@ fun analyzeFile(path: String): String {
             trim.startsWith("package ") -> packageName = trim.substring(8).trim()
             trim.startsWith("import ") -> imports++
             trim.contains(" fun ") && !trim.startsWith("//") && !trim.startsWith("*") -> {
-                val match = Regex("fun\\\\s+(\\\\w+)").find(trim)
+                val match = FUN_RE.find(trim)
                 match?.let { functions.add(it.groupValues[1]) }
             }
-            (trim.startsWith("class ") || trim.startsWith("interface ") || 
-             trim.startsWith("object ") || trim.startsWith("data class ")) -> {
+            CLASS_KW.any { trim.startsWith(it) } -> {
                 val className = trim.split(" ")[1].substringBefore("(").substringBefore(":")
                 classes.add(className)
             }
         }
-    }
+    } }
     
     // Return JSON
-    return """{"file":"${file.name}","package":"$packageName","lines":${lines.size},"comments":$comments,"imports":$imports,"functions":${functions.size},"classes":${classes.size},"functionList":${functions.map{"\\"$it\\""}},"classList":${classes.map{"\\"$it\\""}}}"""
+    return """{"file":${jsonString(file.name)},"package":${jsonString(packageName)},"lines":$lineCount,"comments":$comments,"imports":$imports,"functions":${functions.size},"classes":${classes.size},"functionList":${jsonArray(functions)},"classList":${jsonArray(classes)}}"""
+}
+
+fun analyzeSafely(path: String): String = try {
+    analyzeFile(path)
+} catch (e: Exception) {
+    """{"error":${jsonString(e.message ?: e.toString())}}"""
 }
 
 fun main(args: Array<String>) {
     if (args.isNotEmpty()) {
-        try {
-            println(analyzeFile(args[0]))
-        } catch (e: Exception) {
-            println("""{"error":"${e.message}"}""")
-        }
+        println(analyzeSafely(args[0]))
+        return
+    }
+    // Persistent mode: one path per line on stdin, one JSON line per path
+    generateSequence(::readLine).forEach { path ->
+        println(analyzeSafely(path))
+        System.out.flush()
     }
 }
 '''
+
+
+class KotlinWorker:
+    """A persistent analyzer JVM that reads file paths from stdin."""
+    
+    def __init__(self, analyzer_jar: Path, timeout: float = 5):
+        self.analyzer_jar = analyzer_jar
+        self.timeout = timeout
+        self.proc = None
+    
+    def _start_process(self):
+        """Start the analyzer JVM."""
+        self.proc = subprocess.Popen(
+            ["java", "-jar", str(self.analyzer_jar)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+    
+    def _request(self, file_path: str) -> bytes:
+        """Send one path to the JVM and read its JSON line.
+        
+        A watchdog kills the JVM if no answer arrives within the timeout;
+        the next request starts a fresh one.
+        """
+        if self.proc is None or self.proc.poll() is not None:
+            self._start_process()
+        proc = self.proc
+        
+        timed_out = threading.Event()
+        
+        def expire():
+            timed_out.set()
+            proc.kill()
+        
+        watchdog = threading.Timer(self.timeout, expire)
+        watchdog.start()
+        try:
+            proc.stdin.write(os.fsencode(file_path) + b"\n")
+            proc.stdin.flush()
+            output = proc.stdout.readline()
+        except (BrokenPipeError, ValueError):
+            output = b""
+        finally:
+            watchdog.cancel()
+        
+        if not output:
+            self.close()
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(proc.args, self.timeout)
+            raise RuntimeError("Analyzer process exited unexpectedly")
+        return output
+    
+    def analyze(self, file_path: str) -> Dict:
+        """Analyze one file."""
+        # Both parsers take the raw bytes, so the line is never decoded to str
+        output = self._request(file_path)
+        if ORJSON_AVAILABLE:
+            return orjson.loads(output)
+        return json.loads(output)
+    
+    def close(self):
+        """Terminate the JVM."""
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class BundledJarWorker:
+    """Runs the bundled simple_analyzer.jar once per file.
+    
+    Same interface as KotlinWorker, for machines without kotlinc.
+    """
+    
+    def __init__(self, analyzer_jar: Path, timeout: float = 5):
+        self.analyzer_jar = analyzer_jar
+        self.timeout = timeout
+    
+    def analyze(self, file_path: str) -> Dict:
+        """Analyze one file from the JAR's text report."""
+        result = subprocess.run(
+            ["java", "-jar", str(self.analyzer_jar), file_path],
+            capture_output=True,
+            text=True,
+            timeout=self.timeout
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Analyzer exited with status {result.returncode}")
+        
+        lines = result.stdout.strip().split('\n')
+        return {
+            'file': Path(file_path).name,
+            'package': lines[2].split(': ')[1] if len(lines) > 2 else '',
+            'lines': int(lines[3].split(': ')[1]) if len(lines) > 3 else 0,
+            'comments': int(lines[5].split(': ')[1].split(' ')[0]) if len(lines) > 5 else 0,
+            'functions': [],
+            'classes': []
+        }
+    
+    def close(self):
+        """Nothing to release; each analysis is its own process."""
+
+
+class SafeKotlinAnalyzer:
+    """
+    Safe Kotlin analyzer that won't hang on comment-heavy files.
+    Uses a pre-compiled Kotlin analyzer JAR instead of regex.
+    """
+    
+    _indexes_ready = False
+    
+    # Upserts KotlinFile nodes from _file_row dicts
+    SAVE_FILES_QUERY = """
+        UNWIND $rows AS r
+        MERGE (f:KotlinFile {path: r.path})
+        SET f.name = r.name,
+            f.package = r.package,
+            f.project = r.project,
+            f.totalLines = r.lines,
+            f.commentLines = r.comments
+    """
+    
+    def __init__(self, neo4j_uri: str = "bolt://localhost:7687",
+                 username: str = "neo4j", 
+                 password: str = "password123"):
+        self.driver = GraphDatabase.driver(neo4j_uri, auth=(username, password),
+                                           max_connection_pool_size=50)
+        self.analyzer_jar = self._setup_analyzer()
+        self.worker = self._new_worker()
+        self._pending: List[Dict] = []
+        self._ensure_indexes()
+    
+    def _ensure_indexes(self):
+        """Index KotlinFile.path so the batched MERGE is a lookup, once per process."""
+        if SafeKotlinAnalyzer._indexes_ready:
+            return
+        self._write("CREATE INDEX kotlin_file_path IF NOT EXISTS FOR (f:KotlinFile) ON (f.path)")
+        SafeKotlinAnalyzer._indexes_ready = True
+        
+    def _setup_analyzer(self) -> Path:
+        """Setup the safe analyzer JAR, compiling it only when the source changed."""
+        digest = hashlib.sha256(ANALYZER_SOURCE.encode()).hexdigest()[:12]
+        jar_file = JAR_CACHE_DIR / f"safe_analyzer.{digest}.jar"
+        if jar_file.exists():
+            return jar_file
         
         # Write and compile
-        kt_file = Path("safe_analyzer.kt")
-        jar_file = Path("safe_analyzer.jar")
+        JAR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        kt_file = JAR_CACHE_DIR / f"safe_analyzer.{digest}.kt"
+        # Compile under a private name so a concurrent run never sees a
+        # half-written JAR
+        tmp_jar = JAR_CACHE_DIR / f"safe_analyzer.{digest}.{os.getpid()}.jar"
         
         try:
-            kt_file.write_text(analyzer_code)
+            kt_file.write_text(ANALYZER_SOURCE)
             
             # Compile to JAR
             result = subprocess.run(
-                ["kotlinc", str(kt_file), "-include-runtime", "-d", str(jar_file)],
+                ["kotlinc", str(kt_file), "-include-runtime", "-d", str(tmp_jar)],
                 capture_output=True,
                 text=True
             )
             
-            if result.returncode == 0 and jar_file.exists():
+            if result.returncode == 0 and tmp_jar.exists():
                 kt_file.unlink()  # Clean up source
+                os.replace(tmp_jar, jar_file)
                 return jar_file
             else:
                 raise Exception(f"Compilation failed: {result.stderr}")
                 
         except Exception as e:
             print(f"⚠️  Could not create analyzer JAR: {e}")
-            # Fall back to simple_analyzer.jar if available
-            if local_jar.exists():
-                return local_jar
-            raise
+            bundled_jar = self._find_bundled_jar()
+            if bundled_jar is None:
+                raise RuntimeError(
+                    f"No Kotlin analyzer available: kotlinc failed ({e}) "
+                    f"and no {BUNDLED_JAR_NAME} was found"
+                ) from e
+            print(f"   Falling back to {bundled_jar} (one JVM per file)")
+            return bundled_jar
+    
+    @staticmethod
+    def _find_bundled_jar() -> Optional[Path]:
+        """Locate simple_analyzer.jar in the working directory or the source checkout."""
+        for candidate in (Path(BUNDLED_JAR_NAME),
+                          Path(__file__).resolve().parents[2] / BUNDLED_JAR_NAME):
+            if candidate.exists():
+                return candidate
+        return None
+    
+    def _new_worker(self) -> Union[KotlinWorker, BundledJarWorker]:
+        """Create an analyzer worker suited to the JAR in use."""
+        if self.analyzer_jar.name == BUNDLED_JAR_NAME:
+            return BundledJarWorker(self.analyzer_jar)
+        return KotlinWorker(self.analyzer_jar)
+    
+    def _write(self, query: str, **params):
+        """Run a write query in its own transaction."""
+        with self.driver.session() as session:
+            session.execute_write(lambda tx: tx.run(query, params).consume())
     
-    def analyze_file(self, file_path: str) -> Optional[Dict]:
-        """Analyze single file safely."""
+    def close(self):
+        """Terminate the persistent analyzer JVM and close the driver."""
+        self.worker.close()
+        self.driver.close()
+    
+    def analyze_file(self, file_path: str,
+                     worker: Optional[Union[KotlinWorker, BundledJarWorker]] = None,
+                     file_size: Optional[int] = None) -> Optional[Dict]:
+        """Analyze single file safely, on the given worker JVM if any.
+        
+        ``file_size`` (bytes) may be passed when already known to skip the stat.
+        """
         try:
             # Check file size
-            file_size = os.path.getsize(file_path) / 1024  # KB
-            if file_size > 1000:  # 1MB limit
-                print(f"⚠️  Skipping large file: {Path(file_path).name} ({file_size:.1f}KB)")
+            if file_size is None:
+                file_size = os.path.getsize(file_path)
+            if file_size > MAX_FILE_SIZE:
+                print(f"⚠️  Skipping large file: {Path(file_path).name} ({file_size / 1024:.1f}KB)")
                 return None
             
-            # Run analyzer
-            result = subprocess.run(
-                ["java", "-jar", str(self.analyzer_jar), file_path],
-                capture_output=True,
-                text=True,
-                timeout=5  # 5 second timeout
-            )
-            
-            if result.returncode == 0:
-                # Parse output
-                output = result.stdout.strip()
-                if output.startswith("==="):
-                    # Handle simple_analyzer.jar format
-                    lines = output.split('\n')
-                    return {
-                        'file': Path(file_path).name,
-                        'package': lines[2].split(': ')[1] if len(lines) > 2 else '',
-                        'lines': int(lines[3].split(': ')[1]) if len(lines) > 3 else 0,
-                        'comments': int(lines[5].split(': ')[1].split(' ')[0]) if len(lines) > 5 else 0,
-                        'functions': [],
-                        'classes': []
-                    }
-                else:
-                    # JSON format
-                    return json.loads(output)
-            else:
-                print(f"❌ Error analyzing {Path(file_path).name}")
-                return None
+            return (worker or self.worker).analyze(file_path)
                 
         except subprocess.TimeoutExpired:
             print(f"⏱️  Timeout analyzing: {Path(file_path).name}")
@@ -163,36 +372,63 @@ fun main(args: Array<String>) {
             print(f"❌ Error analyzing {Path(file_path).name}: {e}")
             return None
     
+    @staticmethod
+    def _walk_kt(root) -> Iterator[Tuple[str, int]]:
+        """Yield (path, size) of .kt files under root, skipping build directories."""
+        stack = [os.fspath(root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.kt'):
+                            # A dangling symlink must not end the directory scan
+                            try:
+                                size = entry.stat().st_size
+                            except OSError:
+                                continue
+                            yield entry.path, size
+            except OSError:
+                continue
+    
     def analyze_project(self, project_path: str, project_name: str, 
                        save_to_neo4j: bool = True, max_files: Optional[int] = None,
-                       batch_size: int = 50) -> Dict:
+                       batch_size: int = 50, max_workers: Optional[int] = None) -> Dict:
         """Safely analyze Kotlin project."""
+        num_workers = max_workers or os.cpu_count() or 1
+        
         print(f"\n🛡️  Safe Kotlin Analysis (No Regex!)")
         print(f"   Project: {project_name}")
         print(f"   Path: {project_path}")
         print(f"   Batch size: {batch_size}")
+        print(f"   Workers: {num_workers}")
         
         start_time = time.time()
         project_path = Path(project_path)
         
-        # Find Kotlin files
-        kotlin_files = []
-        for root, dirs, files in os.walk(project_path):
-            # Skip build directories
-            dirs[:] = [d for d in dirs if d not in {'.gradle', 'build', 'out', '.git', 'node_modules'}]
-            
-            for file in files:
-                if file.endswith('.kt'):
-                    kotlin_files.append(Path(root) / file)
+        # Find Kotlin files, stopping the walk once max_files are found
+        found = list(islice(self._walk_kt(project_path), max_files or None))
+        print(f"   Found {len(found)} Kotlin files")
         
-        if max_files:
-            kotlin_files = kotlin_files[:max_files]
+        if not found:
+            return {'error': 'No Kotlin files found'}
         
+        # Drop oversized files before they reach a worker, and schedule the
+        # largest first so the pool finishes on the quick ones
+        # Per-file problems are reported together at the end
+        problems: List[str] = []
+        kotlin_files = []
+        skipped = 0
+        for path, size in found:
+            if size > MAX_FILE_SIZE:
+                problems.append(f"⚠️  Skipping large file: {Path(path).name} ({size / 1024:.1f}KB)")
+                skipped += 1
+            else:
+                kotlin_files.append((path, size))
+        kotlin_files.sort(key=lambda item: item[1], reverse=True)
         total_files = len(kotlin_files)
-        print(f"   Found {total_files} Kotlin files")
-        
-        if total_files == 0:
-            return {'error': 'No Kotlin files found'}
         
         # Check Java availability
         try:
@@ -204,8 +440,8 @@ fun main(args: Array<String>) {
         if save_to_neo4j:
             # Clear existing data
             print("   Clearing existing data...")
-            self.graph.run("MATCH (n {project: $project}) DETACH DELETE n", 
-                          project=project_name)
+            self._write("MATCH (n {project: $project}) DETACH DELETE n",
+                        project=project_name)
         
         stats = {
             'files': 0,
@@ -213,37 +449,106 @@ fun main(args: Array<String>) {
             'functions': 0,
             'comments': 0,
             'errors': 0,
-            'timeouts': 0
+            'timeouts': 0,
+            'skipped': skipped
         }
         
-        # Process in batches
-        for i in range(0, total_files, batch_size):
-            batch = kotlin_files[i:i + batch_size]
-            batch_num = i // batch_size + 1
-            total_batches = (total_files + batch_size - 1) // batch_size
-            
-            print(f"\n📦 Batch {batch_num}/{total_batches} ({len(batch)} files)")
-            
-            for file_idx, kt_file in enumerate(batch):
-                if file_idx % 10 == 0:
-                    print(f"   Progress: {file_idx}/{len(batch)}")
-                
-                result = self.analyze_file(str(kt_file))
-                
-                if result and 'error' not in result:
-                    stats['files'] += 1
-                    stats['classes'] += result.get('classes', 0) if isinstance(result.get('classes'), int) else len(result.get('classes', []))
-                    stats['functions'] += result.get('functions', 0) if isinstance(result.get('functions'), int) else len(result.get('functions', []))
-                    stats['comments'] += result.get('comments', 0)
+        # Each task checks a worker JVM out of the pool and returns it when
+        # done, so no two files share a JVM's stdin/stdout at once
+        workers = [self._new_worker() for _ in range(num_workers)]
+        idle_workers = queue.Queue()
+        for worker in workers:
+            idle_workers.put(worker)
+        
+        def analyze(kt_file: str) -> Tuple[Optional[Dict], Optional[Exception]]:
+            worker = idle_workers.get()
+            try:
+                return worker.analyze(kt_file), None
+            except Exception as e:
+                return None, e
+            finally:
+                idle_workers.put(worker)
+        
+        # A single writer thread drains finished rows into UNWIND batches,
+        # so Neo4j writes overlap with parsing instead of pausing it
+        write_queue = queue.Queue(maxsize=2 * batch_size)
+        
+        def write_rows():
+            while True:
+                row = write_queue.get()
+                if row is None:
+                    break
+                self._pending.append(row)
+                if len(self._pending) >= batch_size:
+                    self._flush_neo4j()
+            self._flush_neo4j()
+        
+        writer = None
+        if save_to_neo4j:
+            writer = threading.Thread(target=write_rows, name="kotlin-neo4j-writer", daemon=True)
+            writer.start()
+        
+        done = 0
+        last_report = time.monotonic()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                # Process in batches
+                for i in range(0, total_files, batch_size):
+                    batch = kotlin_files[i:i + batch_size]
+                    batch_num = i // batch_size + 1
+                    total_batches = (total_files + batch_size - 1) // batch_size
+                    
+                    print(f"\n📦 Batch {batch_num}/{total_batches} ({len(batch)} files)")
                     
-                    # Save to Neo4j if enabled
-                    if save_to_neo4j:
-                        self._save_to_neo4j(result, kt_file, project_name)
-                else:
-                    stats['errors'] += 1
+                    futures = {executor.submit(analyze, kt_file): kt_file
+                               for kt_file, _ in batch}
+                    
+                    # Results are aggregated on this thread only
+                    for future in as_completed(futures):
+                        done += 1
+                        now = time.monotonic()
+                        if now - last_report >= 1.0:
+                            print(f"   Progress: {done}/{total_files}")
+                            last_report = now
+                        
+                        kt_file = futures[future]
+                        result, error = future.result()
+                        
+                        if result and 'error' not in result:
+                            stats['files'] += 1
+                            stats['classes'] += result.get('classes', 0) if isinstance(result.get('classes'), int) else len(result.get('classes', []))
+                            stats['functions'] += result.get('functions', 0) if isinstance(result.get('functions'), int) else len(result.get('functions', []))
+                            stats['comments'] += result.get('comments', 0)
+                            
+                            # Hand off to the writer thread
+                            if writer is not None:
+                                write_queue.put(self._file_row(result, kt_file, project_name))
+                        else:
+                            stats['errors'] += 1
+                            name = Path(kt_file).name
+                            if isinstance(error, subprocess.TimeoutExpired):
+                                stats['timeouts'] += 1
+                                problems.append(f"⏱️  Timeout analyzing: {name}")
+                            else:
+                                reason = error if error is not None else (result or {}).get('error', 'no result')
+                                problems.append(f"❌ Error analyzing {name}: {reason}")
+        finally:
+            for worker in workers:
+                worker.close()
+            if writer is not None:
+                write_queue.put(None)  # Flush what is left and stop
+                writer.join()
+        
+        if save_to_neo4j:
+            stamp_project(self._write, project_name)
         
         duration = time.time() - start_time
         
+        if problems:
+            print(f"\n{len(problems)} file(s) not analyzed:")
+            print("\n".join(f"   {problem}" for problem in problems))
+        
         print(f"\n{'='*60}")
         print(f"✅ Safe Analysis Complete!")
         print(f"   Duration: {duration:.1f}s")
@@ -251,26 +556,43 @@ fun main(args: Array<String>) {
         print(f"   Classes: {stats['classes']}")
         print(f"   Functions: {stats['functions']}")
         print(f"   Comment lines: {stats['comments']}")
-        print(f"   Errors: {stats['errors']}")
+        print(f"   Errors: {stats['errors']} ({stats['timeouts']} timeouts)")
+        print(f"   Skipped (too large): {stats['skipped']}")
         print(f"   Speed: {stats['files']/duration:.1f} files/second")
         print(f"\n💪 No regex catastrophic backtracking!")
         
         return stats
     
+    @staticmethod
+    def _file_row(analysis: Dict, file_path, project_name: str) -> Dict:
+        """Properties of the KotlinFile node for one analyzed file."""
+        file_path = os.fspath(file_path)
+        return {
+            'path': file_path,
+            'name': analysis.get('file', os.path.basename(file_path)),
+            'package': analysis.get('package', ''),
+            'project': project_name,
+            'lines': analysis.get('lines', 0),
+            'comments': analysis.get('comments', 0)
+        }
+    
+    def _flush_neo4j(self):
+        """Write all pending KotlinFile rows in a single UNWIND query."""
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            self._write(self.SAVE_FILES_QUERY, rows=rows)
+        except Exception as e:
+            print(f"   Neo4j save error: {e}")
+    
     def _save_to_neo4j(self, analysis: Dict, file_path: Path, project_name: str):
         """Save analysis results to Neo4j."""
         try:
-            # Create file node
-            file_node = Node(
-                "KotlinFile",
-                path=str(file_path),
-                name=analysis.get('file', file_path.name),
-                package=analysis.get('package', ''),
-                project=project_name,
-                totalLines=analysis.get('lines', 0),
-                commentLines=analysis.get('comments', 0)
-            )
-            self.graph.merge(file_node, "KotlinFile", "path")
+            # Create file node with the same parameterised statement as the
+            # batched writes
+            self._write(self.SAVE_FILES_QUERY,
+                        rows=[self._file_row(analysis, file_path, project_name)])
             
         except Exception as e:
             print(f"   Neo4j save error: {e}")
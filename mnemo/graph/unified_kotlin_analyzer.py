@@ -1,13 +1,77 @@
 """Unified Kotlin analyzer with adjustable analysis depth."""
 
+from array import array
 from pathlib import Path
+import json
+import pickle
 import re
-from typing import Dict, List, Set, Tuple, Optional
-from py2neo import Graph, Node, Relationship
+import sqlite3
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterator, List, Set, Tuple, Optional
+from py2neo import Graph
 from datetime import datetime
 import time
-from collections import defaultdict
 import hashlib
+import os
+
+from mnemo.graph.project_stamp import stamp_project, summarise_package_calls
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+CACHE_DB = Path.home() / ".mnemo" / "kotlin_cache.db"
+CACHE_VERSION = 4  # Bump whenever the cache key or result shape changes
+# Blobs can only be read back with the codec that wrote them
+_CACHE_SCHEMA = CACHE_VERSION * 2 + MSGPACK_AVAILABLE
+_INT_ARRAY_EXT = 1  # msgpack extension type for array('i') columns
+
+# Directories pruned during discovery
+SKIP_DIRS = frozenset({'build', '.gradle', 'test', '.git', 'node_modules'})
+
+_PKG_RE = re.compile(r'package\s+([\w.]+)')
+_COMMENT_RE = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
+# Atomic groups and possessive quantifiers (Python 3.11+) keep these linear
+# on long runs of modifiers or whitespace that are not followed by a match
+_FUN_RE = re.compile(r'(?>(?:public|private|internal|protected|open|override|suspend|inline|tailrec)?\s+)*+fun\s++(?:<[\w,\s]+>\s++)?+(\w++)\s*+\(([^)]*+)\)')
+_CLASS_RE = re.compile(r'(?>(?:public|private|internal|protected|open|sealed|data|abstract|inner)?\s+)*+(class|interface|object|enum\s+class)\s++(\w++)(?:<[^>]++>)?+(?:\s*+:\s*([^{]++))?+')
+_INHERIT_RE = re.compile(r'(class|interface)\s++(\w++)(?:<[^>]++>)?+\s*+:\s*([^{]++)')
+_FUN_DECL_RE = re.compile(r'fun\s+\w+')
+_VAL_VAR_RE = re.compile(r'(?:val|var)\s+\w+')
+_COMMA_RE = re.compile(r',\s*')
+# Keywords that look like calls (`if (`, `when {`) but never are
+_KOTLIN_KEYWORDS = frozenset({
+    'if', 'when', 'for', 'while', 'fun', 'return', 'throw', 'try', 'catch', 'class', 'interface'
+})
+_NOT_KEYWORD = r'(?!(?:' + '|'.join(sorted(_KOTLIN_KEYWORDS)) + r')\b)'
+
+# Decision points counted for cyclomatic complexity
+_BRANCH_RE = re.compile(r'\b(?:if|when|for|while|catch)\b')
+
+# Statement-level patterns fused into one alternation per depth so the file
+# is scanned once: imports, caller.callee( and function( / lambda { calls,
+# and decision points. Keywords are excluded from call names so that no
+# branch can swallow a decision point.
+_IMPORT_PART = r'(?P<imp>import\s+(?P<module>[\w.*]+))'
+_CALL_PART = (
+    r'(?P<method>\b' + _NOT_KEYWORD + r'(?P<caller>\w+)\.' + _NOT_KEYWORD + r'(?P<callee>\w+)\s*\()'
+    r'|(?P<call>\b' + _NOT_KEYWORD + r'(?P<name>\w+)\s*(?P<open>[({]))'
+)
+_BRANCH_PART = r'(?P<branch>\b(?:if|when|for|while|catch)\b|\?\s*:)'  # file-level also counts Elvis
+_MEDIUM_SCAN_RE = re.compile('|'.join((_IMPORT_PART, _CALL_PART)))
+_DEEP_SCAN_RE = re.compile('|'.join((_IMPORT_PART, _CALL_PART, _BRANCH_PART)))
+
 
 class UnifiedKotlinAnalyzer:
     """
@@ -21,169 +85,279 @@ class UnifiedKotlinAnalyzer:
     MEDIUM = 2  
     DEEP = 3
     
+    SAVE_PACKAGE_QUERY = """
+    MERGE (p:Package {name: $package})
+    SET p.project = $project
+    """
+    
+    SAVE_FUNCTIONS_QUERY = """
+    MATCH (p:Package {name: $package})
+    UNWIND $rows AS r
+    CREATE (f:Function)
+    SET f = r
+    CREATE (f)-[:BELONGS_TO]->(p)
+    """
+    
+    SAVE_CLASSES_QUERY = """
+    MATCH (p:Package {name: $package})
+    UNWIND $rows AS r
+    CREATE (c:Class)
+    SET c = r.props
+    CREATE (c)-[:BELONGS_TO]->(p)
+    WITH c, r
+    WHERE r.parent IS NOT NULL
+    MERGE (parent:Class {name: r.parent})
+    SET parent.project = $project
+    CREATE (c)-[:EXTENDS]->(parent)
+    """
+    
     def __init__(self, neo4j_uri: str = "bolt://localhost:7687",
                  username: str = "neo4j", 
                  password: str = "password123"):
         self.graph = Graph(neo4j_uri, auth=(username, password))
+        self._cache_db = self._open_cache()
+        
+    @staticmethod
+    def _open_cache() -> sqlite3.Connection:
+        """Open the on-disk analysis cache keyed by file content hash."""
+        CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(CACHE_DB)
+        if db.execute("PRAGMA user_version").fetchone()[0] != _CACHE_SCHEMA:
+            db.execute("DROP TABLE IF EXISTS analysis")
+            db.execute("DROP TABLE IF EXISTS git_state")
+            db.execute(f"PRAGMA user_version = {_CACHE_SCHEMA}")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS analysis ("
+            "path TEXT, digest TEXT, depth INT, blob BLOB, "
+            "PRIMARY KEY (path, digest, depth))"
+        )
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS git_state ("
+            "project_path TEXT PRIMARY KEY, project_name TEXT, depth INT, "
+            "saved INT, head TEXT, dirty TEXT, stamp TEXT)"
+        )
+        return db
+        
+    def close(self):
+        """Flush and close the analysis cache."""
+        self._cache_db.commit()
+        self._cache_db.close()
+        
+    def _cache_get(self, path: str, digest: str, depth: int) -> Optional[dict]:
+        """Return a cached result at the same or greater depth, if any."""
+        row = self._cache_db.execute(
+            "SELECT blob FROM analysis WHERE path = ? AND digest = ? AND depth >= ? "
+            "ORDER BY depth LIMIT 1",
+            (path, digest, depth)
+        ).fetchone()
+        return _unpack_result(row[0]) if row else None
+        
+    def _cache_latest(self, path: str, depth: int) -> Optional[dict]:
+        """Return the last cached result for a path known to be unchanged."""
+        row = self._cache_db.execute(
+            "SELECT blob FROM analysis WHERE path = ? AND depth >= ? ORDER BY depth LIMIT 1",
+            (path, depth)
+        ).fetchone()
+        return _unpack_result(row[0]) if row else None
+        
+    def _cache_put(self, path: str, digest: str, depth: int, result: dict):
+        """Store a result, dropping entries for older versions of the file."""
+        self._cache_db.execute(
+            "DELETE FROM analysis WHERE path = ? AND digest != ?", (path, digest)
+        )
+        self._cache_db.execute(
+            "INSERT OR REPLACE INTO analysis VALUES (?, ?, ?, ?)",
+            (path, digest, depth, _pack_result(result))
+        )
         
     def analyze_file(self, file_path: Path, depth: int = BASIC) -> dict:
         """Analyze a single Kotlin file with specified depth."""
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Remove comments to avoid false positives
-            content = self._remove_comments(content)
+            data = file_path.read_bytes()
+            path = str(file_path)
+            digest = _content_digest(data)
             
-            # Extract package
-            package_match = re.search(r'package\s+([\w.]+)', content)
-            package_name = package_match.group(1) if package_match else "default"
-            
-            result = {
-                'package': package_name,
-                'functions': [],
-                'classes': [],
-                'imports': [],
-                'calls': [],
-                'inheritance': [],
-                'complexity': 0
-            }
-            
-            # BASIC: Extract functions and classes
-            result['functions'] = self._extract_functions(content, depth)
-            result['classes'] = self._extract_classes(content, depth)
-            
-            if depth >= self.MEDIUM:
-                # MEDIUM: Extract imports and calls
-                result['imports'] = re.findall(r'import\s+([\w.*]+)', content)
-                result['calls'] = self._extract_calls(content)
-                
-            if depth >= self.DEEP:
-                # DEEP: Extract inheritance and calculate complexity
-                result['inheritance'] = self._extract_inheritance(content)
-                result['complexity'] = self._calculate_complexity(content)
-                
+            result = self._cache_get(path, digest, depth)
+            if result is None:
+                result = self._analyze_content(data, depth)
+                self._cache_put(path, digest, depth, result)
             return result
             
         except Exception as e:
             print(f"Error analyzing {file_path}: {e}")
-            return {
-                'package': '', 'functions': [], 'classes': [], 
-                'imports': [], 'calls': [], 'inheritance': [], 'complexity': 0
-            }
+            return _empty_result()
     
-    def _remove_comments(self, content: str) -> str:
-        """Remove single-line and multi-line comments."""
-        # Remove single-line comments
-        content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-        # Remove multi-line comments
-        content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-        return content
-    
-    def _extract_functions(self, content: str, depth: int) -> List[Dict]:
-        """Extract functions with varying detail based on depth."""
-        functions = []
-        
-        # Enhanced pattern for functions
-        pattern = r'(?:(?:public|private|internal|protected|open|override|suspend|inline|tailrec)?\s+)*fun\s+(?:<[\w,\s]+>\s+)?(\w+)\s*\(([^)]*)\)'
-        
-        for match in re.finditer(pattern, content):
-            func_name = match.group(1)
-            params = match.group(2)
+    def analyze_file_stats_only(self, file_path: Path, depth: int = BASIC) -> dict:
+        """Count functions, classes and calls without building per-item results.
+        
+        Only BASIC and MEDIUM stats are available this way; 'functions',
+        'classes' and 'calls' are counts and the result is not cached.
+        """
+        try:
+            return self._count_content(file_path.read_bytes(), depth)
+        except Exception as e:
+            print(f"Error analyzing {file_path}: {e}")
+            return _empty_result()
+    
+    @classmethod
+    def _count_content(cls, data: bytes, depth: int) -> dict:
+        """Stats-only counterpart of _analyze_content."""
+        content = data.decode('utf-8', errors='ignore')
+        if b'//' in data or b'/*' in data:
+            content = cls._remove_comments(content)
+        
+        package_match = _PKG_RE.search(content)
+        counts = {
+            'package': package_match.group(1) if package_match else "default",
+            'functions': sum(1 for _ in _FUN_RE.finditer(content)),
+            'classes': sum(1 for _ in _CLASS_RE.finditer(content)),
+            'imports': [],
+            'calls': 0
+        }
+        
+        if depth >= cls.MEDIUM:
+            calls = 0
+            for match in _MEDIUM_SCAN_RE.finditer(content):
+                if match.lastgroup == 'imp':
+                    counts['imports'].append(match.group('module'))
+                else:
+                    calls += 1
+            counts['calls'] = min(calls, 50)  # Same cap as _scan_statements
             
-            func_info = {'name': func_name}
+        return counts
+    
+    @classmethod
+    def _analyze_content(cls, data: bytes, depth: int) -> dict:
+        """Run the regex passes over raw file content."""
+        content = data.decode('utf-8', errors='ignore')
+        
+        # Remove comments to avoid false positives
+        if b'//' in data or b'/*' in data:
+            content = cls._remove_comments(content)
+        
+        # Extract package
+        package_match = _PKG_RE.search(content)
+        package_name = package_match.group(1) if package_match else "default"
+        
+        result = {
+            'package': package_name,
+            'functions': {},
+            'classes': {},
+            'imports': [],
+            'calls': [],
+            'inheritance': [],
+            'complexity': 0
+        }
+        
+        # Brace depth and newline tables shared by every body lookup in this file
+        index = cls._content_index(content) if depth >= cls.DEEP and NUMPY_AVAILABLE else None
+        
+        # BASIC: Extract functions and classes
+        result['functions'] = cls._extract_functions(content, depth, index)
+        result['classes'] = cls._extract_classes(content, depth, index)
+        
+        if depth >= cls.MEDIUM:
+            # MEDIUM: Extract imports and calls (DEEP: and complexity) in one scan
+            result['imports'], result['calls'], result['complexity'] = \
+                cls._scan_statements(content, depth)
             
-            if depth >= self.MEDIUM:
+        if depth >= cls.DEEP:
+            # DEEP: Extract inheritance
+            result['inheritance'] = cls._extract_inheritance(content)
+            
+        return result
+    
+    @staticmethod
+    def _remove_comments(content: str) -> str:
+        """Remove single-line and multi-line comments."""
+        return _COMMENT_RE.sub('', content)
+    
+    @classmethod
+    def _extract_functions(cls, content: str, depth: int, index=None) -> Dict[str, list]:
+        """Extract functions as column arrays, filled according to depth."""
+        functions = _function_columns()
+        
+        for match in _FUN_RE.finditer(content):
+            functions['name'].append(match.group(1))
+            
+            if depth >= cls.MEDIUM:
                 # Parse parameters
-                func_info['params'] = self._parse_parameters(params)
-                func_info['start_pos'] = match.start()
+                functions['params'].append(cls._parse_parameters(match.group(2)))
+                functions['start_pos'].append(match.start())
                 
-            if depth >= self.DEEP:
+            if depth >= cls.DEEP:
                 # Extract function body for complexity
-                func_body = self._extract_function_body(content, match.end())
-                func_info['lines'] = func_body.count('\n') + 1
-                func_info['cyclomatic_complexity'] = self._calculate_cyclomatic(func_body)
+                start, end = cls._extract_function_body(content, match.end(), index)
+                functions['lines'].append(cls._count_lines(content, start, end, index))
+                functions['cyclomatic_complexity'].append(cls._calculate_cyclomatic(content, start, end))
                 
-            functions.append(func_info)
-            
         return functions
     
-    def _extract_classes(self, content: str, depth: int) -> List[Dict]:
-        """Extract classes with varying detail based on depth."""
-        classes = []
-        
-        pattern = r'(?:(?:public|private|internal|protected|open|sealed|data|abstract|inner)?\s+)*(class|interface|object|enum\s+class)\s+(\w+)(?:<[^>]+>)?(?:\s*:\s*([^{]+))?'
+    @classmethod
+    def _extract_classes(cls, content: str, depth: int, index=None) -> Dict[str, list]:
+        """Extract classes as column arrays, filled according to depth."""
+        classes = _class_columns()
         
-        for match in re.finditer(pattern, content):
-            class_type = match.group(1)
-            class_name = match.group(2)
+        for match in _CLASS_RE.finditer(content):
+            classes['name'].append(match.group(2))
+            classes['type'].append(match.group(1))
             
-            class_info = {
-                'name': class_name,
-                'type': class_type
-            }
-            
-            if depth >= self.MEDIUM:
+            if depth >= cls.MEDIUM:
                 inheritance = match.group(3)
-                if inheritance:
-                    class_info['extends'] = inheritance.strip()
+                classes['extends'].append(inheritance.strip() if inheritance else None)
                     
-            if depth >= self.DEEP:
+            if depth >= cls.DEEP:
                 # Extract class body
-                class_body = self._extract_class_body(content, match.end())
-                class_info['methods'] = len(re.findall(r'fun\s+\w+', class_body))
-                class_info['properties'] = len(re.findall(r'(?:val|var)\s+\w+', class_body))
+                start, end = cls._extract_class_body(content, match.end(), index)
+                classes['methods'].append(len(_FUN_DECL_RE.findall(content, start, end)))
+                classes['properties'].append(len(_VAL_VAR_RE.findall(content, start, end)))
                 
-            classes.append(class_info)
-            
         return classes
     
-    def _extract_calls(self, content: str) -> List[Dict]:
-        """Extract function calls."""
-        calls = []
+    @classmethod
+    def _scan_statements(cls, content: str, depth: int) -> Tuple[List[str], List[Dict], int]:
+        """Return imports, calls and file complexity from a single regex pass.
         
-        # Various call patterns
-        patterns = [
-            (r'(\w+)\s*\(', 'function'),
-            (r'(\w+)\.(\w+)\s*\(', 'method'),
-            (r'(\w+)\s*\{', 'lambda'),
-        ]
+        Complexity is only counted at DEEP depth and is 0 otherwise.
+        """
+        imports = []
+        calls = []
+        branches = 0
         
-        keywords = {'if', 'when', 'for', 'while', 'fun', 'return', 'throw', 'try', 'catch', 'class', 'interface'}
-        
-        for pattern, call_type in patterns:
-            for match in re.finditer(pattern, content):
-                if call_type == 'method':
-                    caller = match.group(1)
-                    callee = match.group(2)
-                    if callee not in keywords:
-                        calls.append({
-                            'type': call_type,
-                            'caller': caller,
-                            'callee': callee
-                        })
-                else:
-                    callee = match.group(1)
-                    if callee not in keywords:
-                        calls.append({
-                            'type': call_type,
-                            'callee': callee
-                        })
-                        
-        return calls[:50]  # Limit to prevent memory issues
+        scan = _DEEP_SCAN_RE if depth >= cls.DEEP else _MEDIUM_SCAN_RE
+        for match in scan.finditer(content):
+            kind = match.lastgroup
+            if kind == 'branch':
+                branches += 1
+            elif kind == 'imp':
+                imports.append(match.group('module'))
+            elif len(calls) >= 50:  # Limit to prevent memory issues
+                continue
+            elif kind == 'method':
+                calls.append({
+                    'type': 'method',
+                    'caller': match.group('caller'),
+                    'callee': match.group('callee')
+                })
+            else:
+                calls.append({
+                    'type': 'function' if match.group('open') == '(' else 'lambda',
+                    'callee': match.group('name')
+                })
+                
+        return imports, calls, (1 + branches if depth >= cls.DEEP else 0)
     
-    def _extract_inheritance(self, content: str) -> List[Dict]:
+    @staticmethod
+    def _extract_inheritance(content: str) -> List[Dict]:
         """Extract inheritance relationships."""
         inheritance = []
         
-        # Pattern for class inheritance
-        pattern = r'(class|interface)\s+(\w+)(?:<[^>]+>)?\s*:\s*([^{]+)'
-        
-        for match in re.finditer(pattern, content):
+        for match in _INHERIT_RE.finditer(content):
             child = match.group(2)
             parents = match.group(3).strip()
             
             # Split multiple inheritance/implementations
-            for parent in re.split(r',\s*', parents):
+            for parent in _COMMA_RE.split(parents):
                 parent = parent.strip()
                 if parent:
                     inheritance.append({
@@ -193,35 +367,56 @@ class UnifiedKotlinAnalyzer:
                     
         return inheritance
     
-    def _calculate_complexity(self, content: str) -> int:
-        """Calculate overall file complexity."""
-        # Count decision points
-        complexity = 1
-        complexity += len(re.findall(r'\bif\b', content))
-        complexity += len(re.findall(r'\bwhen\b', content))
-        complexity += len(re.findall(r'\bfor\b', content))
-        complexity += len(re.findall(r'\bwhile\b', content))
-        complexity += len(re.findall(r'\bcatch\b', content))
-        complexity += len(re.findall(r'\?\s*:', content))  # Elvis operator
-        
-        return complexity
-    
-    def _parse_parameters(self, params: str) -> List[str]:
+    @staticmethod
+    def _parse_parameters(params: str) -> List[str]:
         """Parse function parameters."""
         if not params.strip():
             return []
         
         # Simple parameter parsing
-        params = re.split(r',\s*', params)
+        params = _COMMA_RE.split(params)
         return [p.split(':')[0].strip() for p in params if ':' in p]
     
-    def _extract_function_body(self, content: str, start: int) -> str:
-        """Extract function body starting from position."""
+    @staticmethod
+    def _content_index(content: str) -> Tuple['np.ndarray', ...]:
+        """Return '{' and '}' masks, the running brace depth and newline offsets."""
+        # UTF-32 keeps array indices aligned with string indices
+        codes = np.frombuffer(content.encode('utf-32-le'), dtype=np.uint32)
+        opens = codes == ord('{')
+        closes = codes == ord('}')
+        depth = np.cumsum(opens.astype(np.int32) - closes)
+        return opens, closes, depth, np.flatnonzero(codes == ord('\n'))
+    
+    @staticmethod
+    def _count_lines(content: str, start: int, end: int, index=None) -> int:
+        """Count the lines spanned by content[start:end] without slicing it."""
+        if index is not None:
+            newlines = index[3]
+            return int(np.searchsorted(newlines, end) - np.searchsorted(newlines, start)) + 1
+        return content.count('\n', start, end) + 1
+    
+    @staticmethod
+    def _extract_function_body(content: str, start: int, index=None) -> Tuple[int, int]:
+        """Return the (start, end) span of the body following position; empty if none."""
+        stop = min(start + 2000, len(content))  # Limit search
+        if index is not None:
+            if start >= stop:
+                return start, start
+            opens, closes, depth = index[:3]
+            first_open = start + int(np.argmax(opens[start:stop]))
+            if not opens[first_open]:
+                return start, start
+            # The body ends at the first '}' that returns to the starting depth
+            base = depth[start - 1] if start else 0
+            after = first_open + 1
+            hits = np.flatnonzero(closes[after:stop] & (depth[after:stop] == base))
+            return (start, after + int(hits[0]) + 1) if hits.size else (start, start)
+        
         brace_count = 0
         in_body = False
         end = start
         
-        for i in range(start, min(start + 2000, len(content))):  # Limit search
+        for i in range(start, stop):
             if content[i] == '{':
                 brace_count += 1
                 in_body = True
@@ -231,41 +426,77 @@ class UnifiedKotlinAnalyzer:
                     end = i + 1
                     break
                     
-        return content[start:end] if end > start else ""
+        return start, end
     
-    def _extract_class_body(self, content: str, start: int) -> str:
-        """Extract class body starting from position."""
-        return self._extract_function_body(content, start)  # Same logic
+    @classmethod
+    def _extract_class_body(cls, content: str, start: int, index=None) -> Tuple[int, int]:
+        """Return the (start, end) span of the class body following position."""
+        return cls._extract_function_body(content, start, index)  # Same logic
     
-    def _calculate_cyclomatic(self, body: str) -> int:
-        """Calculate cyclomatic complexity of code block."""
-        complexity = 1
-        complexity += len(re.findall(r'\bif\b', body))
-        complexity += len(re.findall(r'\bwhen\b', body))
-        complexity += len(re.findall(r'\bfor\b', body))
-        complexity += len(re.findall(r'\bwhile\b', body))
-        complexity += len(re.findall(r'\bcatch\b', body))
-        
-        return complexity
+    @staticmethod
+    def _calculate_cyclomatic(content: str, start: int, end: int) -> int:
+        """Calculate cyclomatic complexity of the code block content[start:end]."""
+        return 1 + len(_BRANCH_RE.findall(content, start, end))
+    
+    @staticmethod
+    def _walk_kotlin(root: Path) -> Iterator[str]:
+        """Yield paths of .kt files under root without descending into skipped directories."""
+        stack = [os.fspath(root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.kt') and entry.is_file():
+                            yield entry.path
+            except OSError:
+                continue
     
     def analyze_project(self, project_path: str, project_name: str, 
-                       depth: int = MEDIUM, save_to_neo4j: bool = True) -> Dict:
+                       depth: int = MEDIUM, save_to_neo4j: bool = True,
+                       max_workers: Optional[int] = None) -> Dict:
         """Analyze entire project with specified depth."""
         print(f"🔍 Analyzing {project_name} with depth={depth}...")
         start_time = time.time()
         
-        if save_to_neo4j:
+        project_path = Path(project_path).resolve()
+        kotlin_files = list(self._walk_kotlin(project_path))
+        
+        # Walked paths all start with the project root, so strip it as a string
+        project_prefix = os.path.join(os.fspath(project_path), '')
+        
+        def relative(path: str) -> str:
+            return path[len(project_prefix):] if path.startswith(project_prefix) else path
+        
+        # Tracked files git reports as untouched since the last run skip
+        # hashing, and if that run saved the same project at this depth into
+        # the graph still on the Neo4j side, only the rest are rewritten
+        head, dirty, changed, tracked, previous = self._git_changes(project_path)
+        unchanged = set()
+        if changed is not None:
+            print(f"  {len(changed)} Kotlin files changed since the last analyzed commit")
+            unchanged = {f for f in kotlin_files
+                         if relative(f) in tracked and relative(f) not in changed}
+        # Ignored files are invisible to git, so they are re-read every run and
+        # remembered with the dirty files to catch their deletion next time
+        volatile = dirty | {relative(f) for f in kotlin_files if relative(f) not in tracked}
+        refresh = {relative(f) for f in kotlin_files if f not in unchanged}
+        incremental = (changed is not None and save_to_neo4j
+                       and previous[:3] == (project_name, depth, True)
+                       and previous[3] is not None
+                       and previous[3] == self._analysis_run(project_name))
+        
+        if incremental and (changed or refresh):
+            self.graph.run("MATCH (n {project: $project}) WHERE n.file_path IN $paths "
+                          "DETACH DELETE n", project=project_name,
+                          paths=list(changed | refresh))
+        elif save_to_neo4j and not incremental:
             # Clear existing data
             self.graph.run("MATCH (n {project: $project}) DETACH DELETE n", 
                           project=project_name)
         
-        project_path = Path(project_path)
-        kotlin_files = list(project_path.rglob("*.kt"))
-        
-        # Filter out build directories
-        kotlin_files = [f for f in kotlin_files 
-                       if not any(skip in str(f) for skip in ['/build/', '/.gradle/', '/test/'])]
-        
         stats = {
             'files': 0,
             'functions': 0,
@@ -274,69 +505,96 @@ class UnifiedKotlinAnalyzer:
             'imports': 0,
             'inheritance': 0,
             'avg_complexity': 0,
-            'package_dependencies': defaultdict(set),
-            'duplicate_functions': defaultdict(list),
+            'package_dependencies': {},
+            'duplicate_functions': {},
             'complex_functions': []
         }
         
         all_complexities = []
         
+        # Locations are only kept as tuples, and only for names seen twice
+        seen_once: Dict[str, Tuple[str, str]] = {}
+        dup_locations: Dict[str, List[Tuple[str, str]]] = {}
+        
         # Process files
-        for idx, kt_file in enumerate(kotlin_files):
+        # Without Neo4j, BASIC and MEDIUM stats only need per-file counts
+        stats_only = not save_to_neo4j and depth < self.DEEP
+        results = self._iter_results(kotlin_files, depth, max_workers, unchanged, stats_only)
+        for idx, (kt_file, result) in enumerate(results):
             if idx % 10 == 0:
                 print(f"  Processing file {idx}/{len(kotlin_files)}...")
             
-            result = self.analyze_file(kt_file, depth)
-            relative_path = kt_file.relative_to(project_path)
+            relative_path = relative(kt_file)
+            # Results arrive deserialized from workers or the cache, so intern the
+            # package name here to share one string across the project's files
+            package = sys.intern(result['package'])
             
             # Update stats
             stats['files'] += 1
-            stats['functions'] += len(result['functions'])
-            stats['classes'] += len(result['classes'])
+            functions = result['functions']
+            stats['functions'] += _count(functions, 'name')
+            stats['classes'] += _count(result['classes'], 'name')
             stats['imports'] += len(result['imports'])
             
             if depth >= self.MEDIUM:
-                stats['calls'] += len(result['calls'])
+                stats['calls'] += _count(result['calls'])
                 
                 # Track package dependencies
+                dependencies = None
                 for imp in result['imports']:
-                    if not imp.startswith('java.') and not imp.startswith('kotlin.'):
-                        stats['package_dependencies'][result['package']].add(imp)
+                    if not imp.startswith(('java.', 'kotlin.')):
+                        if dependencies is None:
+                            dependencies = stats['package_dependencies'].setdefault(package, set())
+                        dependencies.add(sys.intern(imp))
                         
             if depth >= self.DEEP:
                 stats['inheritance'] += len(result['inheritance'])
                 all_complexities.append(result['complexity'])
                 
                 # Track duplicate functions
-                for func in result['functions']:
-                    stats['duplicate_functions'][func['name']].append({
-                        'package': result['package'],
-                        'file': str(relative_path)
-                    })
+                location = (package, relative_path)
+                for name in functions['name']:
+                    if name in dup_locations:
+                        dup_locations[name].append(location)
+                    elif name in seen_once:
+                        dup_locations[name] = [seen_once.pop(name), location]
+                    else:
+                        seen_once[name] = location
                     
-                    # Track complex functions
-                    if 'cyclomatic_complexity' in func and func['cyclomatic_complexity'] > 10:
+                # Track complex functions
+                for name, complexity in zip(functions['name'], functions['cyclomatic_complexity']):
+                    if complexity > 10:
                         stats['complex_functions'].append({
-                            'name': func['name'],
-                            'package': result['package'],
-                            'complexity': func['cyclomatic_complexity'],
-                            'file': str(relative_path)
+                            'name': name,
+                            'package': package,
+                            'complexity': complexity,
+                            'file': relative_path
                         })
             
             # Save to Neo4j if enabled
-            if save_to_neo4j:
+            if save_to_neo4j and not (incremental and relative_path not in refresh):
                 self._save_to_neo4j(result, relative_path, project_name, depth)
         
+        run_id = None
+        if save_to_neo4j:
+            run_id = stamp_project(self.graph.run, project_name)
+            summarise_package_calls(self.graph.run, project_name, run_id)
+        
+        if head:
+            self._cache_db.execute(
+                "INSERT OR REPLACE INTO git_state VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(project_path), project_name, depth, int(save_to_neo4j), head,
+                 json.dumps(sorted(volatile)), run_id)
+            )
+        self._cache_db.commit()
+        
         # Calculate averages
         if all_complexities:
             stats['avg_complexity'] = sum(all_complexities) / len(all_complexities)
         
-        # Convert defaultdicts to regular dicts
-        stats['package_dependencies'] = dict(stats['package_dependencies'])
         stats['duplicate_functions'] = {
-            name: locations 
-            for name, locations in stats['duplicate_functions'].items() 
-            if len(locations) > 1
+            name: [{'package': package, 'file': file} for package, file in locations]
+            for name, locations in dup_locations.items()
         }
         
         elapsed = time.time() - start_time
@@ -347,69 +605,152 @@ class UnifiedKotlinAnalyzer:
         
         return stats
     
-    def _save_to_neo4j(self, result: Dict, file_path: Path, project_name: str, depth: int):
-        """Save analysis results to Neo4j."""
-        # Create package node
-        package_node = Node(
-            "Package",
-            name=result['package'],
-            project=project_name
-        )
-        self.graph.merge(package_node, "Package", "name")
-        
-        # Create function nodes
-        for func in result['functions']:
-            func_node = Node(
-                "Function",
-                name=func['name'],
-                full_name=f"{result['package']}.{func['name']}",
-                package=result['package'],
-                file_path=str(file_path),
-                project=project_name,
-                language="kotlin"
-            )
-            
-            if depth >= self.DEEP and 'cyclomatic_complexity' in func:
-                func_node['complexity'] = func['cyclomatic_complexity']
-                func_node['lines'] = func.get('lines', 0)
-                
-            self.graph.create(func_node)
-            
-            # Create relationship to package
-            rel = Relationship(func_node, "BELONGS_TO", package_node)
-            self.graph.create(rel)
-        
-        # Create class nodes
-        for cls in result['classes']:
-            class_node = Node(
-                "Class",
-                name=cls['name'],
-                full_name=f"{result['package']}.{cls['name']}",
-                package=result['package'],
-                file_path=str(file_path),
-                project=project_name,
-                language="kotlin",
-                type=cls['type']
+    @staticmethod
+    def _git(project_path: Path, *args: str) -> Optional[List[str]]:
+        """Run a git command in the project, returning its output lines."""
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=project_path,
+                capture_output=True,
+                text=True
             )
-            
-            if depth >= self.DEEP:
-                class_node['methods'] = cls.get('methods', 0)
-                class_node['properties'] = cls.get('properties', 0)
-                
-            self.graph.create(class_node)
-            
-            # Create relationship to package
-            rel = Relationship(class_node, "BELONGS_TO", package_node)
-            self.graph.create(rel)
-            
-            # Create inheritance relationships
-            if depth >= self.MEDIUM and 'extends' in cls:
-                parent_name = cls['extends'].split('(')[0].strip()
-                parent_node = Node("Class", name=parent_name, project=project_name)
-                self.graph.merge(parent_node, "Class", "name")
-                
-                inherit_rel = Relationship(class_node, "EXTENDS", parent_node)
-                self.graph.create(inherit_rel)
+        except OSError:
+            return None
+        return result.stdout.splitlines() if result.returncode == 0 else None
+    
+    def _analysis_run(self, project_name: str) -> Optional[str]:
+        """Return the analysis run id stamped on the project in Neo4j, if any."""
+        return self.graph.run(
+            "MATCH (p:Project {name: $project}) RETURN p.analysis_run",
+            project=project_name
+        ).evaluate()
+    
+    def _git_changes(self, project_path: Path) -> Tuple[Optional[str], Set[str], Optional[Set[str]],
+                                                        Set[str], Optional[tuple]]:
+        """Return (HEAD, uncommitted .kt files, .kt files changed since the last run,
+        tracked .kt files, last run).
+        
+        The changed set is None when it cannot be trusted (not a git checkout,
+        no previous run, or the previous HEAD is no longer reachable).
+        """
+        head = self._git(project_path, "rev-parse", "HEAD")
+        modified = self._git(project_path, "diff", "--name-only", "--relative", "HEAD", "--", "*.kt")
+        untracked = self._git(project_path, "ls-files", "--others", "--exclude-standard", "--", "*.kt")
+        tracked = self._git(project_path, "ls-files", "--", "*.kt")
+        if not head or modified is None or untracked is None or tracked is None:
+            return None, set(), None, set(), None
+        head = head[0]
+        dirty = set(modified) | set(untracked)
+        tracked = set(tracked)
+        
+        row = self._cache_db.execute(
+            "SELECT project_name, depth, saved, head, dirty, stamp FROM git_state "
+            "WHERE project_path = ?",
+            (str(project_path),)
+        ).fetchone()
+        if not row:
+            return head, dirty, None, tracked, None
+        
+        committed = self._git(project_path, "diff", "--name-only", "--relative",
+                              row[3], head, "--", "*.kt")
+        if committed is None:
+            return head, dirty, None, tracked, None
+        
+        # Files dirty or ignored during the last run may have been cached with
+        # content that never reached a commit, so they count as changed too
+        changed = set(committed) | dirty | set(json.loads(row[4]))
+        return head, dirty, changed, tracked, (row[0], row[1], bool(row[2]), row[5])
+    
+    def _iter_results(self, kotlin_files: List[str], depth: int,
+                      max_workers: Optional[int] = None,
+                      unchanged: Set[str] = frozenset(),
+                      stats_only: bool = False) -> Iterator[Tuple[str, dict]]:
+        """Yield (file, result) pairs, analyzing cache misses in a process pool.
+        
+        With stats_only, misses are only counted (see analyze_file_stats_only)
+        and are not cached; cache hits are still full results.
+        """
+        misses = []
+        for kt_file in kotlin_files:
+            if kt_file in unchanged:
+                result = self._cache_latest(kt_file, depth)
+                if result is not None:
+                    yield kt_file, result
+                    continue
+            try:
+                with open(kt_file, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                print(f"Error analyzing {kt_file}: {e}")
+                yield kt_file, _empty_result()
+                continue
+            result = self._cache_get(kt_file, _content_digest(data), depth)
+            if result is None:
+                misses.append(kt_file)
+            else:
+                yield kt_file, result
+        
+        if not misses:
+            return
+        
+        # Regex work is CPU bound; results come back to this process so the
+        # cache and Neo4j writes stay serialized
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            worker = _stats_worker if stats_only else _analyze_worker
+            analyzed = executor.map(worker, misses, repeat(depth), chunksize=8)
+            for kt_file, (digest, result) in zip(misses, analyzed):
+                if digest:
+                    self._cache_put(kt_file, digest, depth, result)
+                yield kt_file, result
+    
+    def _save_to_neo4j(self, result: Dict, file_path: str, project_name: str, depth: int):
+        """Save analysis results to Neo4j in a single transaction."""
+        package = result['package']
+        common = {
+            'package': package,
+            'namespace': package,
+            'file_path': file_path,
+            'project': project_name,
+            'language': "kotlin"
+        }
+        
+        functions = result['functions']
+        function_rows = [
+            dict(common, name=name, full_name=f"{package}.{name}")
+            for name in functions['name']
+        ]
+        if depth >= self.DEEP:
+            for row, complexity, lines in zip(function_rows,
+                                              functions['cyclomatic_complexity'],
+                                              functions['lines']):
+                row['complexity'] = complexity
+                row['lines'] = lines
+        
+        classes = result['classes']
+        class_rows = [
+            {'props': dict(common, name=name, full_name=f"{package}.{name}", type=class_type),
+             'parent': None}
+            for name, class_type in zip(classes['name'], classes['type'])
+        ]
+        if depth >= self.MEDIUM:
+            for row, extends in zip(class_rows, classes['extends']):
+                if extends:
+                    row['parent'] = extends.split('(')[0].strip()
+        if depth >= self.DEEP:
+            for row, methods, properties in zip(class_rows, classes['methods'],
+                                                classes['properties']):
+                row['props']['methods'] = methods
+                row['props']['properties'] = properties
+        
+        tx = self.graph.begin()
+        tx.run(self.SAVE_PACKAGE_QUERY, package=package, project=project_name)
+        if function_rows:
+            tx.run(self.SAVE_FUNCTIONS_QUERY, package=package, rows=function_rows)
+        if class_rows:
+            tx.run(self.SAVE_CLASSES_QUERY, package=package, project=project_name,
+                   rows=class_rows)
+        self.graph.commit(tx)
     
     def _print_summary(self, stats: Dict, depth: int):
         """Print analysis summary based on depth."""
@@ -500,4 +841,88 @@ class UnifiedKotlinAnalyzer:
         RETURN f.name as name, f.package as package, f.file_path as file
         LIMIT 20
         """
-        return self.graph.run(query, project=project_name).data()
\ No newline at end of file
+        return self.graph.run(query, project=project_name).data()
+
+
+def _pack_array(obj):
+    """msgpack default hook: store int column arrays as raw bytes."""
+    if isinstance(obj, array):
+        return msgpack.ExtType(_INT_ARRAY_EXT, obj.tobytes())
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _unpack_array(code: int, data: bytes):
+    """msgpack ext hook: rebuild int column arrays."""
+    if code == _INT_ARRAY_EXT:
+        return array('i', data)
+    return msgpack.ExtType(code, data)
+
+
+def _pack_result(result: dict) -> bytes:
+    """Serialize an analysis result for the cache, preferring msgpack."""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(result, use_bin_type=True, default=_pack_array)
+    return pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+
+
+def _unpack_result(blob: bytes) -> dict:
+    """Inverse of _pack_result."""
+    if MSGPACK_AVAILABLE:
+        return msgpack.unpackb(blob, raw=False, ext_hook=_unpack_array)
+    return pickle.loads(blob)
+
+
+def _count(value, column: Optional[str] = None) -> int:
+    """Size of a result field, which stats-only results already store as a count."""
+    if isinstance(value, int):
+        return value
+    return len(value[column]) if column else len(value)
+
+
+def _content_digest(data: bytes) -> str:
+    """Fingerprint file content for the local cache; no cryptographic strength needed."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _function_columns() -> Dict[str, list]:
+    """Empty per-file function columns; numeric columns are int arrays."""
+    return {
+        'name': [], 'params': [], 'start_pos': array('i'),
+        'lines': array('i'), 'cyclomatic_complexity': array('i')
+    }
+
+
+def _class_columns() -> Dict[str, list]:
+    """Empty per-file class columns; numeric columns are int arrays."""
+    return {
+        'name': [], 'type': [], 'extends': [],
+        'methods': array('i'), 'properties': array('i')
+    }
+
+
+def _empty_result() -> dict:
+    """Result returned for files that could not be analyzed."""
+    return {
+        'package': '', 'functions': _function_columns(), 'classes': _class_columns(),
+        'imports': [], 'calls': [], 'inheritance': [], 'complexity': 0
+    }
+
+
+def _analyze_worker(path: str, depth: int) -> Tuple[Optional[str], dict]:
+    """Process pool entry point: returns (content digest, result)."""
+    try:
+        data = Path(path).read_bytes()
+        return (_content_digest(data),
+                UnifiedKotlinAnalyzer._analyze_content(data, depth))
+    except Exception as e:
+        print(f"Error analyzing {path}: {e}")
+        return None, _empty_result()
+
+
+def _stats_worker(path: str, depth: int) -> Tuple[None, dict]:
+    """Process pool entry point for stats-only runs; results are never cached."""
+    try:
+        return None, UnifiedKotlinAnalyzer._count_content(Path(path).read_bytes(), depth)
+    except Exception as e:
+        print(f"Error analyzing {path}: {e}")
+        return None, _empty_result()
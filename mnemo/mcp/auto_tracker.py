@@ -2,43 +2,135 @@
 
 import asyncio
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Callable, Iterable, List, Optional, Dict, Any
 import os
 
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 from mnemo.memory.client import MnemoMemoryClient
 from mnemo.trackers import GitActivityTracker, CodeChangeTracker
 
 
+class ProjectChangeHandler(FileSystemEventHandler):
+    """Report working tree edits and git HEAD/ref updates, ignoring build output."""
+    
+    IGNORED_DIRS = frozenset({
+        '.git', 'build', '.gradle', 'node_modules', '__pycache__',
+        '.venv', 'venv', '.idea', 'mnemo_db'
+    })
+    CHANGE_EVENTS = frozenset({'created', 'modified', 'deleted', 'moved'})
+    
+    def __init__(
+        self,
+        project_path: str,
+        on_change: Callable[[], None],
+        ignored_paths: Iterable[str] = ()
+    ):
+        self.project_path = project_path
+        self.on_change = on_change
+        # Our own data directories (Chroma, embedding cache); writes there must
+        # never schedule another run
+        self.ignored_paths = tuple(os.path.realpath(p) for p in ignored_paths)
+        
+    def on_any_event(self, event):
+        # Opened/closed events fire on reads too, including our own git calls
+        if event.event_type in self.CHANGE_EVENTS and self._is_relevant(event.src_path):
+            self.on_change()
+            
+    def _is_relevant(self, path: str) -> bool:
+        for ignored in self.ignored_paths:
+            if path == ignored or path.startswith(ignored + os.sep):
+                return False
+        parts = os.path.relpath(path, self.project_path).split(os.sep)
+        if parts[0] == '.git':
+            # Commits and branch switches; index and object writes are noise
+            return len(parts) > 1 and parts[1] in ('HEAD', 'refs')
+        return not any(part in self.IGNORED_DIRS for part in parts)
+
+
 class AutoProjectTracker:
     """Automatically tracks and records project activities."""
     
-    def __init__(self, memory_client: MnemoMemoryClient):
+    MIN_INTERVAL = 10  # Seconds; bursts of file events collapse into one run
+    
+    def __init__(
+        self,
+        memory_client: MnemoMemoryClient,
+        ignored_paths: Optional[List[str]] = None
+    ):
         self.memory_client = memory_client
         self.project_path = os.getcwd()
+        self.ignored_paths = list(ignored_paths or [])
+        persist_directory = getattr(
+            getattr(memory_client, "vector_store", None), "persist_directory", None
+        )
+        if persist_directory:
+            self.ignored_paths.append(persist_directory)
         self.git_tracker = GitActivityTracker(memory_client, self.project_path)
         self.code_tracker = CodeChangeTracker(memory_client, self.project_path)
         self.tracking_interval = 300  # 5 minutes default
         self.is_tracking = False
         self._tracking_task: Optional[asyncio.Task] = None
+        self._observer: Optional[Observer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scheduled: Optional[asyncio.TimerHandle] = None
+        self._last_run = float('-inf')
     
     async def start_tracking(self, interval: int = 300):
-        """Start automatic tracking."""
+        """Start automatic tracking.
+        
+        Tracking runs when the project changes on disk, at most once every
+        MIN_INTERVAL seconds. If the file watcher cannot start, it falls back
+        to polling every `interval` seconds.
+        """
         if self.is_tracking:
             return
         
         self.tracking_interval = interval
         self.is_tracking = True
-        self._tracking_task = asyncio.create_task(self._tracking_loop())
+        self._loop = asyncio.get_running_loop()
+        
+        try:
+            self._observer = Observer()
+            self._observer.schedule(
+                ProjectChangeHandler(
+                    self.project_path, self._notify_change, self.ignored_paths
+                ),
+                self.project_path,
+                recursive=True
+            )
+            self._observer.start()
+        except OSError as e:
+            print(f"[AUTO-TRACKING] File watcher unavailable ({e}), polling instead")
+            self._observer = None
+            self._tracking_task = asyncio.create_task(self._tracking_loop())
         
         # Initial tracking
         await self._track_once()
         
         print(f"[AUTO-TRACKING] Started tracking for project: {self.project_path}")
-        print(f"   Interval: {interval} seconds")
+        if self._observer:
+            print(f"   Watching for changes (min interval: {self.MIN_INTERVAL} seconds)")
+        else:
+            print(f"   Interval: {interval} seconds")
     
     async def stop_tracking(self):
         """Stop automatic tracking."""
         self.is_tracking = False
+        if self._observer:
+            self._observer.stop()
+            await asyncio.to_thread(self._observer.join)
+            self._observer = None
+        if self._scheduled:
+            self._scheduled.cancel()
+            self._scheduled = None
         if self._tracking_task:
             self._tracking_task.cancel()
             try:
@@ -48,8 +140,32 @@ class AutoProjectTracker:
         
         print("[AUTO-TRACKING] Stopped tracking")
     
+    def _notify_change(self):
+        """Called from the watchdog thread; hands off to the event loop."""
+        self._loop.call_soon_threadsafe(self._schedule_tracking)
+    
+    def _schedule_tracking(self):
+        """Schedule one tracking run, no sooner than MIN_INTERVAL after the last."""
+        if not self.is_tracking or self._scheduled:
+            return
+        delay = max(0.0, self._last_run + self.MIN_INTERVAL - self._loop.time())
+        self._scheduled = self._loop.call_later(delay, self._start_scheduled_run)
+    
+    def _start_scheduled_run(self):
+        """Timer callback: start the tracking run as a task."""
+        self._scheduled = None
+        if self.is_tracking:
+            self._tracking_task = asyncio.create_task(self._track_safely())
+    
+    async def _track_safely(self):
+        """Run one tracking iteration, logging instead of raising."""
+        try:
+            await self._track_once()
+        except Exception as e:
+            print(f"Error in tracking loop: {e}")
+    
     async def _tracking_loop(self):
-        """Main tracking loop."""
+        """Polling loop, used when file watching is unavailable."""
         while self.is_tracking:
             try:
                 await asyncio.sleep(self.tracking_interval)
@@ -61,6 +177,7 @@ class AutoProjectTracker:
     
     async def _track_once(self):
         """Perform one tracking iteration."""
+        self._last_run = asyncio.get_running_loop().time()
         timestamp = datetime.now()
         
         # Track git activities
@@ -130,6 +247,13 @@ class SessionMemoryTracker:
             'decision', 'implement', 'change', 'fix', 'bug', 'feature',
             'remember', 'important', 'todo', 'plan', 'design'
         }
+        self._keyword_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            # One linear scan finds any keyword instead of one scan per keyword
+            self._keyword_automaton = ahocorasick.Automaton()
+            for keyword in self.important_keywords:
+                self._keyword_automaton.add_word(keyword, keyword)
+            self._keyword_automaton.make_automaton()
     
     def add_message(self, role: str, content: str, message_type: str = "chat"):
         """Add a message to the session."""
@@ -154,6 +278,8 @@ class SessionMemoryTracker:
     def _is_important_message(self, content: str) -> bool:
         """Check if message contains important keywords."""
         content_lower = content.lower()
+        if self._keyword_automaton is not None:
+            return next(self._keyword_automaton.iter(content_lower), None) is not None
         return any(keyword in content_lower for keyword in self.important_keywords)
     
     def _save_session_summary(self):
@@ -1,14 +1,122 @@
 """Batch analyzer for handling large projects without timeout."""
 
+import ast
 import asyncio
+import multiprocessing
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
 import json
+import mmap
+import sqlite3
+import threading
+import time
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
 
 from mnemo.memory.client import MnemoMemoryClient
 
+LANGUAGE_EXTENSIONS = {
+    'python': ('.py',),
+    'kotlin': ('.kt', '.kts'),
+    'javascript': ('.js', '.jsx'),
+    'typescript': ('.ts', '.tsx'),
+    'java': ('.java',),
+}
+
+# Common directories that never hold project sources
+SKIP_DIRS = frozenset({
+    'node_modules', 'venv', 'env', '.git', '__pycache__',
+    'build', 'dist', 'target', '.gradle', '.idea', 'generated'
+})
+
+# Generated sources (protobuf stubs, minified bundles) skipped by name
+_SKIP_FILE = re.compile(r'(?:_pb2|_pb2_grpc|\.min)\.(?:py|js|ts)$')
+
+# Per-file counts keyed by project root and path, reused while mtime and
+# size are unchanged
+CACHE_DB = Path.home() / ".mnemo" / "batch_cache.db"
+
+# Node type -> index into the (functions, classes, calls) counters
+_COUNT_TYPES = {
+    ast.FunctionDef: 0,
+    ast.AsyncFunctionDef: 0,
+    ast.ClassDef: 1,
+    ast.Call: 2,
+}
+
+# RE2 matches in linear time without backtracking (its \s and \w are ASCII-only)
+_kotlin_re = re2 if RE2_AVAILABLE else re
+_KOTLIN_FUN_PATTERN = r'(?:fun|suspend fun)\s+(\w+)\s*\('
+_KOTLIN_CLASS_PATTERN = r'(?:class|interface|object|data class|sealed class)\s+(\w+)'
+_KOTLIN_FUN = _kotlin_re.compile(_KOTLIN_FUN_PATTERN)
+_KOTLIN_CLASS = _kotlin_re.compile(_KOTLIN_CLASS_PATTERN)
+
+# Kotlin files above this size are memory-mapped and matched as bytes
+MMAP_THRESHOLD = 1024 * 1024
+_KOTLIN_FUN_BYTES = re.compile(_KOTLIN_FUN_PATTERN.encode())
+_KOTLIN_CLASS_BYTES = re.compile(_KOTLIN_CLASS_PATTERN.encode())
+
+
+def _analyze_python_file(path_str: str) -> Optional[Tuple[int, int, int]]:
+    """Count functions, classes and calls in a Python file."""
+    counts = [0, 0, 0]
+    try:
+        # ast.parse decodes bytes itself, honouring any coding declaration
+        with open(path_str, 'rb') as f:
+            source = f.read()
+
+        stack = [ast.parse(source, filename=path_str)]
+        while stack:
+            node = stack.pop()
+            index = _COUNT_TYPES.get(type(node))
+            if index is not None:
+                counts[index] += 1
+            stack.extend(ast.iter_child_nodes(node))
+
+    except Exception as e:
+        print(f"[BATCH] Error processing {path_str}: {e}")
+        return None
+
+    return counts[0], counts[1], counts[2]
+
+
+def _analyze_kotlin_file(path_str: str) -> Optional[Tuple[int, int, int]]:
+    """Count functions and classes in a Kotlin file using regex."""
+    try:
+        if os.path.getsize(path_str) > MMAP_THRESHOLD:
+            # Scan large files straight from the page cache
+            with open(path_str, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                functions = sum(1 for _ in _KOTLIN_FUN_BYTES.finditer(content))
+                classes = sum(1 for _ in _KOTLIN_CLASS_BYTES.finditer(content))
+        else:
+            with open(path_str, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+            functions = sum(1 for _ in _KOTLIN_FUN.finditer(content))
+            classes = sum(1 for _ in _KOTLIN_CLASS.finditer(content))
+
+    except Exception as e:
+        print(f"[BATCH] Error processing {path_str}: {e}")
+        return None
+
+    return functions, classes, 0
+
+
+_FILE_ANALYZERS = {
+    'python': _analyze_python_file,
+    'kotlin': _analyze_kotlin_file,
+}
+
 
 class BatchProjectAnalyzer:
     """Analyze large projects in batches to avoid timeouts."""
@@ -17,6 +125,13 @@ class BatchProjectAnalyzer:
         self.memory_client = memory_client
         self.batch_size = 50  # Files per batch
         self.progress_callback = None
+        self.checkpoint_flush_size = 4  # Checkpoints per memory write
+        self.max_file_size = 2 * 1024 * 1024  # Larger files are skipped
+        self.skipped_files = 0
+        self._pending_writes: List[Dict[str, Any]] = []
+        # Opened on first use from a worker thread, never on the event loop
+        self._cache_db: Optional[sqlite3.Connection] = None
+        self._cache_lock = threading.Lock()
         
     async def analyze_project_async(
         self, 
@@ -28,16 +143,13 @@ class BatchProjectAnalyzer:
         """Analyze project in batches with progress reporting."""
         self.progress_callback = progress_callback
         
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
         project_path = Path(project_path)
+        project_root = os.path.abspath(project_path)
+        # Stamped on every cache row this run sees, for pruning at the end
+        run_id = time.time_ns()
+        self.skipped_files = 0
         
-        # Collect all files to analyze
-        files = self._collect_files(project_path, language)
-        total_files = len(files)
-        
-        print(f"[BATCH] Found {total_files} files to analyze")
-        
-        # Process in batches
         results = {
             'files': 0,
             'functions': 0,
@@ -47,50 +159,102 @@ class BatchProjectAnalyzer:
             'batches_processed': 0
         }
         
-        for i in range(0, total_files, self.batch_size):
-            batch = files[i:i + self.batch_size]
-            batch_num = i // self.batch_size + 1
-            
-            # Report progress
-            progress = (i / total_files) * 100
-            await self._report_progress(
-                f"Processing batch {batch_num} ({i}/{total_files} files)",
-                progress
-            )
-            
-            # Process batch
+        # Discovery feeds a bounded queue so walking and parsing overlap
+        workers = os.cpu_count() or 1
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * workers)
+        found_files = 0
+        done_files = 0
+        
+        async def produce():
+            nonlocal found_files
+            files = self._collect_files(project_path, language)
+            batch_num = 0
             try:
-                batch_result = await self._process_batch(
-                    batch, project_name, language
-                )
+                while True:
+                    batch = await asyncio.to_thread(
+                        list, islice(files, self.batch_size)
+                    )
+                    if not batch:
+                        break
+                    batch_num += 1
+                    found_files += len(batch)
+                    await queue.put((batch_num, batch))
+            finally:
+                for _ in range(workers):
+                    await queue.put(None)
+            
+            print(f"[BATCH] Found {found_files} files to analyze "
+                  f"({self.skipped_files} generated or oversized files skipped)")
+        
+        async def consume(executor: ProcessPoolExecutor):
+            nonlocal done_files
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                batch_num, batch = item
                 
-                # Aggregate results
-                results['files'] += batch_result.get('files', 0)
-                results['functions'] += batch_result.get('functions', 0)
-                results['classes'] += batch_result.get('classes', 0)
-                results['calls'] += batch_result.get('calls', 0)
-                results['batches_processed'] += 1
+                # Report progress against the files discovered so far
+                progress = (done_files / found_files) * 100
+                await self._report_progress(
+                    f"Processing batch {batch_num} ({done_files}/{found_files} files)",
+                    progress
+                )
                 
-                # Save intermediate results to memory
-                if self.memory_client and i % (self.batch_size * 5) == 0:
-                    await self._save_intermediate_results(
-                        project_name, results, progress
+                # Process batch
+                try:
+                    batch_result = await self._process_batch(
+                        batch, project_root, language, executor, run_id
                     )
                     
-                # Small delay to prevent overwhelming the system
-                await asyncio.sleep(0.1)
+                    # Aggregate results
+                    results['files'] += batch_result.get('files', 0)
+                    results['functions'] += batch_result.get('functions', 0)
+                    results['classes'] += batch_result.get('classes', 0)
+                    results['calls'] += batch_result.get('calls', 0)
+                    results['batches_processed'] += 1
+                    
+                    # Save intermediate results to memory
+                    if self.memory_client and results['batches_processed'] % 5 == 1:
+                        await self._save_intermediate_results(
+                            project_name, results, progress
+                        )
+                        
+                except Exception as e:
+                    results['errors'].append({
+                        'batch': batch_num,
+                        'error': str(e)
+                    })
+                    print(f"[BATCH] Error in batch {batch_num}: {e}")
                 
-            except Exception as e:
-                results['errors'].append({
-                    'batch': batch_num,
-                    'error': str(e)
-                })
-                print(f"[BATCH] Error in batch {batch_num}: {e}")
+                done_files += len(batch)
+        
+        # One pool for the whole run; AST walking is CPU-bound. The server
+        # process already runs model, watcher and Chroma threads, so workers
+        # are spawned rather than forked from it
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            await asyncio.gather(
+                produce(),
+                *[consume(executor) for _ in range(workers)]
+            )
+        finally:
+            # Joining the workers blocks, so do it off the event loop; files
+            # still queued when the run is cancelled are dropped
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        
+        # Rows for files this run no longer saw belong to deleted files
+        if not results['errors']:
+            await asyncio.to_thread(self._prune_cache, project_root, run_id)
+        await asyncio.to_thread(self._close_cache)
         
         # Final results
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = (time.monotonic_ns() - start_ns) / 1e9
         results['duration'] = duration
-        results['total_files'] = total_files
+        results['total_files'] = found_files
+        results['skipped_files'] = self.skipped_files
         
         # Save final results
         if self.memory_client:
@@ -100,42 +264,43 @@ class BatchProjectAnalyzer:
         
         return results
     
-    def _collect_files(self, project_path: Path, language: str) -> List[Path]:
-        """Collect all files to analyze based on language."""
-        extensions = {
-            'python': ['.py'],
-            'kotlin': ['.kt', '.kts'],
-            'javascript': ['.js', '.jsx'],
-            'typescript': ['.ts', '.tsx'],
-            'java': ['.java']
-        }
-        
-        file_extensions = extensions.get(language, ['.py'])
-        files = []
+    def _collect_files(self, project_path: Path, language: str) -> Iterator[str]:
+        """Yield absolute paths of all files to analyze based on language.
         
-        # Skip common directories
-        skip_dirs = {
-            'node_modules', 'venv', 'env', '.git', '__pycache__',
-            'build', 'dist', 'target', '.gradle', '.idea'
-        }
-        
-        for root, dirs, filenames in os.walk(project_path):
-            # Remove skip directories from dirs to prevent walking into them
-            dirs[:] = [d for d in dirs if d not in skip_dirs]
-            
-            for filename in filenames:
-                if any(filename.endswith(ext) for ext in file_extensions):
-                    files.append(Path(root) / filename)
+        Generated and oversized files are counted in skipped_files instead.
+        """
+        file_extensions = LANGUAGE_EXTENSIONS.get(language, ('.py',))
         
-        return files
+        stack = [os.path.abspath(project_path)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Don't walk into skipped directories
+                            if entry.name not in SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.name.endswith(file_extensions):
+                            try:
+                                size = entry.stat().st_size
+                            except OSError:
+                                continue
+                            if _SKIP_FILE.search(entry.name) or size > self.max_file_size:
+                                self.skipped_files += 1
+                                continue
+                            yield entry.path
+            except OSError:
+                continue
     
     async def _process_batch(
         self, 
-        files: List[Path], 
-        project_name: str,
-        language: str
+        files: List[str], 
+        project_root: str,
+        language: str,
+        executor: ProcessPoolExecutor,
+        run_id: int
     ) -> Dict[str, Any]:
-        """Process a batch of files."""
+        """Process a batch of files in the worker pool."""
         result = {
             'files': len(files),
             'functions': 0,
@@ -143,50 +308,119 @@ class BatchProjectAnalyzer:
             'calls': 0
         }
         
-        if language == "kotlin":
-            # Use regex for Kotlin analysis
-            import re
-            for file_path in files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                    # Count functions and classes using regex
-                    function_pattern = r'(?:fun|suspend fun)\s+(\w+)\s*\('
-                    class_pattern = r'(?:class|interface|object|data class|sealed class)\s+(\w+)'
-                    
-                    functions = re.findall(function_pattern, content)
-                    classes = re.findall(class_pattern, content)
-                    
-                    result['functions'] += len(functions)
-                    result['classes'] += len(classes)
-                    
-                except Exception as e:
-                    print(f"[BATCH] Error processing {file_path}: {e}")
-                    
-        elif language == "python":
-            # Use AST for Python analysis
-            import ast
-            for file_path in files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                    tree = ast.parse(content)
-                    
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.FunctionDef):
-                            result['functions'] += 1
-                        elif isinstance(node, ast.ClassDef):
-                            result['classes'] += 1
-                        elif isinstance(node, ast.Call):
-                            result['calls'] += 1
-                            
-                except Exception as e:
-                    print(f"[BATCH] Error processing {file_path}: {e}")
+        analyze_file = _FILE_ANALYZERS.get(language)
+        if analyze_file is None:
+            return result
+        
+        # Stat calls and cache reads block, so check the cache off the event loop
+        pending = await asyncio.to_thread(
+            self._check_cache, project_root, files, result, run_id
+        )
+        
+        loop = asyncio.get_running_loop()
+        counts = await asyncio.gather(*[
+            loop.run_in_executor(executor, analyze_file, path_str)
+            for path_str, _ in pending
+        ])
+        
+        rows = []
+        for (path_str, st), file_counts in zip(pending, counts):
+            if file_counts is None:
+                continue
+            functions, classes, calls = file_counts
+            result['functions'] += functions
+            result['classes'] += classes
+            result['calls'] += calls
+            rows.append((project_root, path_str, st.st_mtime_ns, st.st_size,
+                         functions, classes, calls, run_id))
+        
+        if rows:
+            await asyncio.to_thread(self._store_counts, rows)
         
         return result
     
+    def _cache_conn(self) -> sqlite3.Connection:
+        """Open the per-file count cache on first use."""
+        if self._cache_db is None:
+            CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(CACHE_DB, check_same_thread=False)
+            # WAL lets concurrent runs upsert rows without rewriting the file
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS counts ("
+                "project TEXT, path TEXT, mtime_ns INT, size INT, "
+                "functions INT, classes INT, calls INT, seen INT, "
+                "PRIMARY KEY (project, path))"
+            )
+            self._cache_db = db
+        return self._cache_db
+    
+    def _close_cache(self):
+        """Close the per-file count cache; the next run reopens it."""
+        with self._cache_lock:
+            if self._cache_db is not None:
+                self._cache_db.close()
+                self._cache_db = None
+    
+    def _check_cache(
+        self,
+        project_root: str,
+        files: List[str],
+        result: Dict[str, Any],
+        run_id: int
+    ) -> List[Tuple[str, os.stat_result]]:
+        """Add cached counts to result and return files that need parsing."""
+        with self._cache_lock:
+            db = self._cache_conn()
+            cached = {
+                row[0]: row[1:]
+                for row in db.execute(
+                    "SELECT path, mtime_ns, size, functions, classes, calls FROM counts "
+                    f"WHERE project = ? AND path IN ({', '.join('?' * len(files))})",
+                    (project_root, *files)
+                )
+            }
+        
+        pending = []
+        hits = []
+        for path_str in files:
+            try:
+                st = os.stat(path_str)
+            except OSError as e:
+                print(f"[BATCH] Error processing {path_str}: {e}")
+                continue
+            
+            entry = cached.get(path_str)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                result['functions'] += entry[2]
+                result['classes'] += entry[3]
+                result['calls'] += entry[4]
+                hits.append((run_id, project_root, path_str))
+            else:
+                pending.append((path_str, st))
+        
+        if hits:
+            with self._cache_lock, self._cache_conn() as db:
+                db.executemany(
+                    "UPDATE counts SET seen = ? WHERE project = ? AND path = ?", hits
+                )
+        
+        return pending
+    
+    def _store_counts(self, rows: List[Tuple]):
+        """Upsert freshly parsed counts."""
+        with self._cache_lock, self._cache_conn() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO counts VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+    
+    def _prune_cache(self, project_root: str, run_id: int):
+        """Drop the project's rows that the run identified by run_id did not see."""
+        with self._cache_lock, self._cache_conn() as db:
+            db.execute(
+                "DELETE FROM counts WHERE project = ? AND seen != ?", (project_root, run_id)
+            )
+    
     async def _report_progress(self, message: str, percentage: float):
         """Report progress to callback or console."""
         if self.progress_callback:
@@ -204,43 +438,54 @@ class BatchProjectAnalyzer:
         results: Dict,
         progress: float
     ):
-        """Save intermediate results to memory."""
+        """Queue intermediate results, writing them once enough have built up."""
         if not self.memory_client:
             return
             
-        self.memory_client.remember(
-            key=f"project_analysis_{project_name}_progress",
-            content=json.dumps({
+        self._pending_writes.append({
+            'key': f"project_analysis_{project_name}_progress",
+            'content': json.dumps({
                 'progress': progress,
                 'results': results,
                 'timestamp': datetime.now().isoformat()
             }),
-            memory_type="fact",
-            tags={project_name, "analysis-progress"}
-        )
+            'memory_type': "fact",
+            'tags': {project_name, "analysis-progress"}
+        })
+        
+        if len(self._pending_writes) >= self.checkpoint_flush_size:
+            await self._flush_pending_writes()
     
     async def _save_final_results(
         self, 
         project_name: str, 
         results: Dict
     ):
-        """Save final analysis results."""
+        """Save final analysis results along with any queued checkpoints."""
         if not self.memory_client:
             return
             
-        self.memory_client.remember(
-            key=f"project_analysis_{project_name}",
-            content=f"Analyzed {project_name}: {results['functions']} functions, "
-                   f"{results['classes']} classes, {results['files']} files in "
-                   f"{results['duration']:.2f}s",
-            memory_type="fact",
-            tags={project_name, "project-analysis", "complete"}
-        )
+        self._pending_writes.append({
+            'key': f"project_analysis_{project_name}",
+            'content': f"Analyzed {project_name}: {results['functions']} functions, "
+                       f"{results['classes']} classes, {results['files']} files in "
+                       f"{results['duration']:.2f}s",
+            'memory_type': "fact",
+            'tags': {project_name, "project-analysis", "complete"}
+        })
         
         # Also save detailed results
-        self.memory_client.remember(
-            key=f"project_analysis_{project_name}_details",
-            content=json.dumps(results),
-            memory_type="fact",
-            tags={project_name, "analysis-details"}
-        )
\ No newline at end of file
+        self._pending_writes.append({
+            'key': f"project_analysis_{project_name}_details",
+            'content': json.dumps(results),
+            'memory_type': "fact",
+            'tags': {project_name, "analysis-details"}
+        })
+        
+        await self._flush_pending_writes()
+    
+    async def _flush_pending_writes(self):
+        """Write all queued memories in a single batch."""
+        entries, self._pending_writes = self._pending_writes, []
+        # Embedding and the store write block, so keep them off the event loop
+        await asyncio.to_thread(self.memory_client.remember_many, entries)
@@ -68,12 +68,17 @@ def test_connection(
     import socket
     import json
     
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    
     console.print(f"Testing connection to {host}:{port}...")
     
     try:
-        # Create socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.connect((host, port))
+        # Connect, failing fast instead of hanging on an unresponsive server
+        sock = socket.create_connection((host, port), timeout=5.0)
+        stream = sock.makefile('rwb')
         
         # Send initialize request
         request = {
@@ -83,11 +88,18 @@ def test_connection(
             "id": 1
         }
         
-        sock.send((json.dumps(request) + '\n').encode('utf-8'))
+        if orjson:
+            stream.write(orjson.dumps(request) + b'\n')
+        else:
+            stream.write((json.dumps(request) + '\n').encode('utf-8'))
+        stream.flush()
         
-        # Read response
-        response = sock.recv(4096).decode('utf-8')
-        response_data = json.loads(response.strip())
+        # Responses are newline-delimited, so read one whole line
+        response = stream.readline()
+        if orjson:
+            response_data = orjson.loads(response)
+        else:
+            response_data = json.loads(response.decode('utf-8'))
         
         if "result" in response_data:
             console.print(Panel(
@@ -105,6 +117,7 @@ def test_connection(
                 border_style="red"
             ))
         
+        stream.close()
         sock.close()
         
     except Exception as e:
@@ -120,7 +133,8 @@ def serve_fastapi(
     host: str = typer.Option("0.0.0.0", help="Host to bind to"),
     port: int = typer.Option(3333, help="Port to bind to"),
     db_path: str = typer.Option("./mnemo_mcp_db", help="Database directory"),
-    collection: str = typer.Option("cursor_memories", help="ChromaDB collection name")
+    collection: str = typer.Option("cursor_memories", help="ChromaDB collection name"),
+    reload: bool = typer.Option(False, help="Reload on code changes (development)")
 ):
     """Start the FastAPI-based MCP server."""
     
@@ -139,7 +153,7 @@ def serve_fastapi(
     ))
     
     from mnemo.mcp.fastapi_server import run_server
-    run_server(host=host, port=port)
+    run_server(host=host, port=port, reload=reload)
 
 
 @app.command()
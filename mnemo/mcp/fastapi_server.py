@@ -1,17 +1,24 @@
 """FastAPI-based MCP server for Mnemo."""
 
 import os
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, List, Any, Optional
 from contextlib import asynccontextmanager
+from functools import partial
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 import uvicorn
 from pydantic import BaseModel
 import json
 import asyncio
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from mnemo.memory.store import MnemoVectorStore
 from mnemo.memory.client import MnemoMemoryClient
 from mnemo.mcp.handlers import ResourceHandler, ToolHandler, PromptHandler
@@ -85,8 +92,23 @@ async def lifespan(app: FastAPI):
     tool_handler = ToolHandler(memory_client)
     prompt_handler = PromptHandler(memory_client)
     
+    # Tool and prompt listings are static, so serialize them once, keyed by by_alias
+    tools = await tool_handler.list_tools()
+    prompts = await prompt_handler.list_prompts()
+    app.state.tools_cache = {
+        by_alias: {"tools": [tool.model_dump(by_alias=by_alias) for tool in tools]}
+        for by_alias in (True, False)
+    }
+    app.state.prompts_cache = {
+        by_alias: {"prompts": [prompt.model_dump(by_alias=by_alias) for prompt in prompts]}
+        for by_alias in (True, False)
+    }
+    
     # Initialize auto tracker with separate client
-    auto_tracker = AutoProjectTracker(auto_tracking_client if auto_tracking_client else memory_client)
+    auto_tracker = AutoProjectTracker(
+        auto_tracking_client if auto_tracking_client else memory_client,
+        ignored_paths=[db_path]
+    )
     
     # Initialize session tracker with separate client
     if session_tracking:
@@ -111,6 +133,8 @@ async def lifespan(app: FastAPI):
     # Cleanup
     if auto_tracker and auto_tracker.is_tracking:
         await auto_tracker.stop_tracking()
+    if tool_handler:
+        tool_handler.close()
     
     print("[MCP Server] Shutting down Mnemo MCP Server")
 
@@ -119,7 +143,8 @@ app = FastAPI(
     title="Mnemo MCP Server",
     description="FastAPI-based MCP server for Mnemo memory system",
     version="0.2.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
 # Add CORS middleware
@@ -142,99 +167,109 @@ async def health_check():
 # SSE endpoint removed - Cursor uses HTTP transport only
 
 
+async def _initialize(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe the server and its capabilities."""
+    return {
+        "protocolVersion": "2025-06-18",
+        "serverInfo": {
+            "name": "mnemo",
+            "version": "0.2.0",
+            "description": "LangChain-powered Universal Memory System for Cursor"
+        },
+        "capabilities": {
+            "resources": {},
+            "tools": {},
+            "prompts": {},
+            "extensions": ["mnemo"]
+        }
+    }
+
+
+async def _list_tools(params: Dict[str, Any], by_alias: bool = True) -> Dict[str, Any]:
+    """List available tools."""
+    return app.state.tools_cache[by_alias]
+
+
+async def _call_tool(params: Dict[str, Any]) -> Any:
+    """Call a tool, recording memory tool usage in the session tracker."""
+    tool_name = params.get("name")
+    arguments = params.get("arguments", {})
+    
+    print(f"[MCP DEBUG] Tool call: {tool_name}")
+    print(f"[MCP DEBUG] Arguments: {arguments}")
+    
+    # Track session if enabled
+    if session_tracker and tool_name in ["remember", "recall", "search"]:
+        # Extract meaningful content from arguments
+        content = arguments.get("content") or arguments.get("query") or str(arguments)
+        session_tracker.add_message("user", f"Tool: {tool_name} - {content}", "tool_call")
+    
+    print(f"[MCP DEBUG] Calling tool handler...")
+    result = await tool_handler.call_tool(tool_name, arguments)
+    print(f"[MCP DEBUG] Tool handler returned: {type(result)}")
+    print(f"[MCP DEBUG] Result content: {result}")
+    
+    # Track result if session tracking enabled
+    if session_tracker and tool_name in ["remember", "recall", "search"]:
+        result_summary = str(result)[:200] if result else "No result"
+        session_tracker.add_message("assistant", f"Result: {result_summary}", "tool_result")
+    
+    return result
+
+
+async def _call_tool_legacy(params: Dict[str, Any]) -> Any:
+    """Call a tool without session tracking."""
+    tool_name = params.get("name")
+    arguments = params.get("arguments", {})
+    return await tool_handler.call_tool(tool_name, arguments)
+
+
+async def _list_resources(params: Dict[str, Any], by_alias: bool = True) -> Dict[str, Any]:
+    """List available resources."""
+    resources = await resource_handler.list_resources()
+    return {"resources": [res.model_dump(by_alias=by_alias) for res in resources]}
+
+
+async def _read_resource(params: Dict[str, Any]) -> Any:
+    """Read a resource by URI."""
+    return await resource_handler.read_resource(params.get("uri"))
+
+
+async def _list_prompts(params: Dict[str, Any], by_alias: bool = True) -> Dict[str, Any]:
+    """List available prompts."""
+    return app.state.prompts_cache[by_alias]
+
+
+async def _get_prompt(params: Dict[str, Any]) -> Any:
+    """Render a prompt with arguments."""
+    return await prompt_handler.get_prompt(params.get("name"), params.get("arguments", {}))
+
+
+# MCP method -> handler; legacy camelCase names share the current handlers
+_DISPATCH: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+    "initialize": _initialize,
+    "tools/list": _list_tools,
+    "listTools": partial(_list_tools, by_alias=False),
+    "tools/call": _call_tool,
+    "callTool": _call_tool_legacy,
+    "resources/list": _list_resources,
+    "listResources": partial(_list_resources, by_alias=False),
+    "resources/read": _read_resource,
+    "readResource": _read_resource,
+    "prompts/list": _list_prompts,
+    "listPrompts": partial(_list_prompts, by_alias=False),
+    "prompts/get": _get_prompt,
+    "getPrompt": _get_prompt,
+}
+
+
 @app.post("/mcp")
 async def handle_mcp_request(request: MCPRequestModel):
     """Handle MCP requests."""
     print(f"📥 Received MCP request: {request.method}")
     try:
-        # Process based on method
-        if request.method == "initialize":
-            result = {
-                "protocolVersion": "2025-06-18",
-                "serverInfo": {
-                    "name": "mnemo",
-                    "version": "0.2.0",
-                    "description": "LangChain-powered Universal Memory System for Cursor"
-                },
-                "capabilities": {
-                    "resources": {},
-                    "tools": {},
-                    "prompts": {},
-                    "extensions": ["mnemo"]
-                }
-            }
-        
-        elif request.method == "tools/list":
-            tools = await tool_handler.list_tools()
-            result = {"tools": [tool.dict(by_alias=True) for tool in tools]}
-        
-        elif request.method == "listTools":  # Legacy support
-            tools = await tool_handler.list_tools()
-            result = {"tools": [tool.dict() for tool in tools]}
-        
-        elif request.method == "tools/call":
-            tool_name = request.params.get("name")
-            arguments = request.params.get("arguments", {})
-            
-            print(f"[MCP DEBUG] Tool call: {tool_name}")
-            print(f"[MCP DEBUG] Arguments: {arguments}")
-            
-            # Track session if enabled
-            if session_tracker and tool_name in ["remember", "recall", "search"]:
-                # Extract meaningful content from arguments
-                content = arguments.get("content") or arguments.get("query") or str(arguments)
-                session_tracker.add_message("user", f"Tool: {tool_name} - {content}", "tool_call")
-            
-            print(f"[MCP DEBUG] Calling tool handler...")
-            result = await tool_handler.call_tool(tool_name, arguments)
-            print(f"[MCP DEBUG] Tool handler returned: {type(result)}")
-            print(f"[MCP DEBUG] Result content: {result}")
-            
-            # Track result if session tracking enabled
-            if session_tracker and tool_name in ["remember", "recall", "search"]:
-                result_summary = str(result)[:200] if result else "No result"
-                session_tracker.add_message("assistant", f"Result: {result_summary}", "tool_result")
-        
-        elif request.method == "callTool":  # Legacy support
-            tool_name = request.params.get("name")
-            arguments = request.params.get("arguments", {})
-            result = await tool_handler.call_tool(tool_name, arguments)
-        
-        elif request.method == "resources/list":
-            resources = await resource_handler.list_resources()
-            result = {"resources": [res.dict(by_alias=True) for res in resources]}
-        
-        elif request.method == "listResources":  # Legacy support
-            resources = await resource_handler.list_resources()
-            result = {"resources": [res.dict() for res in resources]}
-        
-        elif request.method == "resources/read":
-            uri = request.params.get("uri")
-            result = await resource_handler.read_resource(uri)
-        
-        elif request.method == "readResource":  # Legacy support
-            uri = request.params.get("uri")
-            result = await resource_handler.read_resource(uri)
-        
-        elif request.method == "prompts/list":
-            prompts = await prompt_handler.list_prompts()
-            result = {"prompts": [prompt.dict(by_alias=True) for prompt in prompts]}
-        
-        elif request.method == "listPrompts":  # Legacy support
-            prompts = await prompt_handler.list_prompts()
-            result = {"prompts": [prompt.dict() for prompt in prompts]}
-        
-        elif request.method == "prompts/get":
-            name = request.params.get("name")
-            arguments = request.params.get("arguments", {})
-            result = await prompt_handler.get_prompt(name, arguments)
-        
-        elif request.method == "getPrompt":  # Legacy support
-            name = request.params.get("name")
-            arguments = request.params.get("arguments", {})
-            result = await prompt_handler.get_prompt(name, arguments)
-        
-        else:
+        handler = _DISPATCH.get(request.method)
+        if handler is None:
             return {
                 "jsonrpc": "2.0",
                 "error": {
@@ -244,6 +279,8 @@ async def handle_mcp_request(request: MCPRequestModel):
                 "id": request.id
             }
         
+        result = await handler(request.params)
+        
         # Return success response
         return {
             "jsonrpc": "2.0",
@@ -266,13 +303,32 @@ async def handle_mcp_request(request: MCPRequestModel):
         }
 
 
-def run_server(host: str = "0.0.0.0", port: int = 3333):
+def run_server(
+    host: str = "0.0.0.0",
+    port: int = 3333,
+    reload: bool = False,
+    workers: Optional[int] = None
+):
     """Run the FastAPI server."""
+    if workers is None:
+        workers = int(os.getenv("MNEMO_WORKERS", "1"))
+    
+    # Every worker would open the same persistent Chroma directory and
+    # embedding cache and serve remember/forget writes to it, and the local
+    # store supports a single writer process
+    if workers > 1 and not reload:
+        raise ValueError(
+            f"MNEMO_WORKERS={workers} is not supported: the local Chroma store at "
+            f"{os.getenv('MNEMO_DB_PATH', './mnemo_mcp_db')} supports a single writer process"
+        )
+    
+    # uvicorn ignores workers when reloading, so only reload in development
     uvicorn.run(
         "mnemo.mcp.fastapi_server:app",
         host=host,
         port=port,
-        reload=True,
+        reload=reload,
+        workers=None if reload else workers,
         log_level="info"
     )
 
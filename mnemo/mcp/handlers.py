@@ -141,6 +141,31 @@ class ToolHandler:
     
     def __init__(self, memory_client: MnemoMemoryClient):
         self.memory_client = memory_client
+        self._context_extractor = None
+        self._project_manager = None
+    
+    def _get_context_extractor(self):
+        """Return the shared Neo4j context extractor, creating it on first use."""
+        if self._context_extractor is None:
+            from mnemo.graph.neo4j_context_extractor import Neo4jContextExtractor
+            self._context_extractor = Neo4jContextExtractor()
+        return self._context_extractor
+    
+    def _get_project_manager(self):
+        """Return the shared project context manager, creating it on first use."""
+        if self._project_manager is None:
+            from mnemo.graph.project_context_manager import ProjectContextManager
+            self._project_manager = ProjectContextManager()
+        return self._project_manager
+    
+    def close(self):
+        """Close the Neo4j drivers opened by the graph tools, if any."""
+        if self._context_extractor is not None:
+            self._context_extractor.close()
+            self._context_extractor = None
+        if self._project_manager is not None:
+            self._project_manager.close()
+            self._project_manager = None
     
     async def list_tools(self) -> List[MCPTool]:
         """List available memory tools."""
@@ -876,8 +901,7 @@ class ToolHandler:
             project2 = arguments.get("project2")
             
             try:
-                from mnemo.graph.project_context_manager import ProjectContextManager
-                manager = ProjectContextManager()
+                manager = self._get_project_manager()
                 
                 comparison = manager.compare_projects(project1, project2)
                 
@@ -999,8 +1023,7 @@ class ToolHandler:
         # Neo4j Context Extraction Tools
         elif tool_name == "get_project_context":
             try:
-                from mnemo.graph.neo4j_context_extractor import Neo4jContextExtractor
-                extractor = Neo4jContextExtractor()
+                extractor = self._get_context_extractor()
                 
                 result = extractor.get_project_overview(
                     project_name=arguments["project"]
@@ -1027,8 +1050,7 @@ class ToolHandler:
         
         elif tool_name == "get_function_context":
             try:
-                from mnemo.graph.neo4j_context_extractor import Neo4jContextExtractor
-                extractor = Neo4jContextExtractor()
+                extractor = self._get_context_extractor()
                 
                 result = extractor.get_function_context(
                     project_name=arguments["project"],
@@ -1058,8 +1080,7 @@ class ToolHandler:
         
         elif tool_name == "get_class_hierarchy":
             try:
-                from mnemo.graph.neo4j_context_extractor import Neo4jContextExtractor
-                extractor = Neo4jContextExtractor()
+                extractor = self._get_context_extractor()
                 
                 result = extractor.get_class_hierarchy(
                     project_name=arguments["project"],
@@ -1087,8 +1108,7 @@ class ToolHandler:
         
         elif tool_name == "get_call_graph":
             try:
-                from mnemo.graph.neo4j_context_extractor import Neo4jContextExtractor
-                extractor = Neo4jContextExtractor()
+                extractor = self._get_context_extractor()
                 
                 result = extractor.get_call_graph(
                     project_name=arguments["project"],
@@ -1117,8 +1137,7 @@ class ToolHandler:
         
         elif tool_name == "get_dependencies":
             try:
-                from mnemo.graph.neo4j_context_extractor import Neo4jContextExtractor
-                extractor = Neo4jContextExtractor()
+                extractor = self._get_context_extractor()
                 
                 result = extractor.get_package_dependencies(
                     project_name=arguments["project"],
@@ -87,6 +87,7 @@ class MnemoMCPServer:
             self._server.close()
             await self._server.wait_closed()
             logger.info("MCP server stopped")
+        self.tool_handler.close()
     
     async def _handle_client(self, reader, writer):
         """Handle incoming client connections."""
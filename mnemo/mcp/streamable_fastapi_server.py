@@ -99,7 +99,10 @@ async def lifespan(app: FastAPI):
     prompt_handler = PromptHandler(memory_client)
     
     # Initialize auto tracker with separate client
-    auto_tracker = AutoProjectTracker(auto_tracking_client if auto_tracking_client else memory_client)
+    auto_tracker = AutoProjectTracker(
+        auto_tracking_client if auto_tracking_client else memory_client,
+        ignored_paths=[db_path]
+    )
     
     # Initialize session tracker with separate client
     if session_tracking:
@@ -123,6 +126,8 @@ async def lifespan(app: FastAPI):
     # Cleanup
     if auto_tracker and auto_tracker.is_tracking:
         await auto_tracker.stop_tracking()
+    if tool_handler:
+        tool_handler.close()
     
     print("[Streamable MCP Server] Shutting down Mnemo MCP Server")
 
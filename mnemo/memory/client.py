@@ -66,8 +66,50 @@ class MnemoMemoryClient:
         expires_in_seconds: Optional[int] = None
     ) -> str:
         """Remember something (store a memory)."""
+        metadata = self._build_metadata(
+            key, memory_type, scope, priority, tags, expires_in_seconds
+        )
+        
+        # Store the memory
+        memory_id = self.vector_store.add_memory(content, metadata)
+        
+        return memory_id
+    
+    def remember_many(self, entries: List[Dict[str, Any]]) -> List[str]:
+        """Remember several memories in one vector store write.
+        
+        Each entry holds the keyword arguments accepted by remember().
+        """
+        memories = []
+        for entry in entries:
+            metadata = self._build_metadata(
+                entry["key"],
+                entry.get("memory_type", "fact"),
+                entry.get("scope", "workspace"),
+                entry.get("priority", "medium"),
+                entry.get("tags"),
+                entry.get("expires_in_seconds")
+            )
+            memories.append(MemoryDocument.create(
+                page_content=entry["content"],
+                memory_metadata=metadata
+            ))
         
-        # Create metadata
+        if not memories:
+            return []
+        
+        return self.vector_store.add_memories(memories)
+    
+    def _build_metadata(
+        self,
+        key: str,
+        memory_type: str,
+        scope: str,
+        priority: str,
+        tags: Optional[Set[str]],
+        expires_in_seconds: Optional[int]
+    ) -> MemoryMetadata:
+        """Build memory metadata for the current context."""
         metadata = MemoryMetadata(
             memory_type=MemoryType(memory_type),
             scope=MemoryScope(scope),
@@ -84,10 +126,7 @@ class MnemoMemoryClient:
         if expires_in_seconds:
             metadata.expires_at = datetime.now() + timedelta(seconds=expires_in_seconds)
         
-        # Store the memory
-        memory_id = self.vector_store.add_memory(content, metadata)
-        
-        return memory_id
+        return metadata
     
     def recall(self, query: str, k: int = 1) -> Optional[str]:
         """Recall the most relevant memory for a query."""
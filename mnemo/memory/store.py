@@ -1,7 +1,10 @@
 """LangChain-based vector store for Mnemo."""
 
 from typing import Any, Dict, List, Optional, Set, Tuple
+import hashlib
 import os
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
 
@@ -31,13 +34,32 @@ class MnemoVectorStore:
         else:
             self.embeddings = embedding_function
         
+        # Cache document embeddings on disk, keyed by a hash of the text, so
+        # re-adding unchanged content skips the encoder entirely
+        self.cached_embeddings = CacheBackedEmbeddings.from_bytes_store(
+            self.embeddings,
+            LocalFileStore(os.path.join(persist_directory, "embed_cache")),
+            namespace=self._embedding_namespace()
+        )
+        
         # Initialize ChromaDB
         self.vectorstore = Chroma(
             collection_name=collection_name,
-            embedding_function=self.embeddings,
+            embedding_function=self.cached_embeddings,
             persist_directory=persist_directory
         )
     
+    def _embedding_namespace(self) -> str:
+        """Identify the embedding model so cached vectors never mix models.
+        
+        LocalFileStore only accepts [a-zA-Z0-9_.-/] in keys, so the class and
+        model name are hashed into a hex token rather than used verbatim.
+        """
+        base = getattr(self.embeddings, "base_embeddings", self.embeddings)
+        model = getattr(base, "model_name", None) or getattr(base, "model", None) or ""
+        identity = f"{type(base).__name__}:{model}"
+        return hashlib.blake2b(identity.encode("utf-8"), digest_size=16).hexdigest()
+    
     def add_memory(
         self,
         content: str,
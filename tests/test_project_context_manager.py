@@ -0,0 +1,70 @@
+"""Tests for ProjectContextManager."""
+
+from collections import OrderedDict
+
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("py2neo")
+pytest.importorskip("langchain")
+
+from mnemo.graph.project_context_manager import ProjectContextManager
+
+
+def _manager_returning(rows):
+    # Skip __init__: no Neo4j connection, every read returns *rows*
+    manager = ProjectContextManager.__new__(ProjectContextManager)
+    manager.queries = []
+    manager.cache_size = 256
+    manager._pattern_cache = OrderedDict()
+    
+    def run(query, **params):
+        manager.queries.append(params)
+        return rows
+    
+    manager._run = run
+    return manager
+
+
+def test_similarity_matches_functions_calling_same_named_callees():
+    manager = _manager_returning([
+        {'project': 'app1', 'function': 'app1.save_user', 'calls': ['validate', 'insert', 'log']},
+        {'project': 'app1', 'function': 'app1.render', 'calls': ['template']},
+        {'project': 'app2', 'function': 'app2.create_user', 'calls': ['validate', 'insert']},
+        {'project': 'app2', 'function': 'app2.delete_user', 'calls': ['log', 'remove']},
+    ])
+
+    result = manager.find_similar_patterns('app1', 'app2', pattern_type='similarity')
+
+    assert result[0] == {
+        'source_func': 'app1.save_user',
+        'target_func': 'app2.create_user',
+        'similarity': pytest.approx(2 / 3)
+    }
+    assert {(r['source_func'], r['target_func']) for r in result} == {
+        ('app1.save_user', 'app2.create_user'),
+        ('app1.save_user', 'app2.delete_user'),
+    }
+
+
+def test_similarity_skips_pairs_without_a_shared_callee():
+    manager = _manager_returning([
+        {'project': 'app1', 'function': 'app1.render', 'calls': ['template']},
+        {'project': 'app2', 'function': 'app2.create_user', 'calls': ['validate']},
+    ])
+
+    assert manager.find_similar_patterns('app1', 'app2', pattern_type='similarity') == []
+
+
+def test_suggestions_reuse_cached_keyword_lookups():
+    manager = _manager_returning([
+        {'project': 'app1', 'keyword': 'user', 'function': 'app1.user.save',
+         'file': 'user.py', 'line': 3, 'calls': []},
+    ])
+
+    first = manager.suggest_implementation("save the user", ['app1'])
+    first[0]['pattern']['calls'].append('mutated')
+    second = manager.suggest_implementation("save the user", ['app1'])
+
+    assert len(manager.queries) == 1
+    assert second[0]['pattern']['calls'] == []
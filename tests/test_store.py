@@ -0,0 +1,34 @@
+"""Tests for MnemoVectorStore."""
+
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_community")
+pytest.importorskip("chromadb")
+
+from mnemo.core.embeddings import MnemoEmbeddings
+from mnemo.core.types import MemoryMetadata, MemoryType
+from mnemo.memory.store import MnemoVectorStore
+
+
+def test_embedding_namespace_is_a_valid_store_key(tmp_path):
+    store = MnemoVectorStore(
+        collection_name="test_namespace",
+        persist_directory=str(tmp_path),
+        embedding_function=MnemoEmbeddings(use_mock=True)
+    )
+    namespace = store._embedding_namespace()
+    assert namespace.isalnum()
+
+
+def test_add_memory_through_cached_embeddings(tmp_path):
+    store = MnemoVectorStore(
+        collection_name="test_add",
+        persist_directory=str(tmp_path),
+        embedding_function=MnemoEmbeddings(use_mock=True)
+    )
+    memory_id = store.add_memory("remember this", MemoryMetadata(memory_type=MemoryType.FACT))
+    
+    memory = store.get_memory_by_id(memory_id)
+    assert memory is not None
+    assert memory.page_content == "remember this"